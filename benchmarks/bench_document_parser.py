@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark: analyze_sources.parse_document() against the helpers it replaced
+(a full read, count_words, splitlines, and the three extract_* functions,
+each splitting the whole document into lines again).
+
+Writes a synthetic corpus (default ~1 GB: many ~200 KB documents plus a few
+large ones) to a temporary directory, checks that both approaches agree on
+every file, then times each over the corpus and measures peak memory on the
+largest document.
+
+Usage:
+    python benchmarks/bench_document_parser.py [--size-mb 1024] [--large-mb 128] [--dir DIR]
+"""
+
+import sys
+import random
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent
+                       / 'skills' / 'building-context-libraries' / 'scripts'))
+
+from analyze_sources import (  # noqa: E402
+    parse_document, extract_yaml_frontmatter, extract_headings, extract_first_paragraph
+)
+from tokenizer import count_words  # noqa: E402
+
+
+DOCUMENT_SIZE = 200_000
+LARGE_DOCUMENTS = 3
+
+
+def legacy_parse(filepath: Path) -> dict:
+    """The pre-parser analysis, as analyze_file() ran it."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return {
+        'words': count_words(content),
+        'lines': len(content.splitlines()),
+        'metadata': extract_yaml_frontmatter(content),
+        'headings': extract_headings(content),
+        'summary': extract_first_paragraph(content),
+    }
+
+
+def synthetic_document(rng: random.Random, size: int, vocab: list) -> str:
+    """Markdown with frontmatter, headings, paragraphs, and lists."""
+    parts = [f"---\ntitle: Document {rng.randint(1, 10**6)}\nauthor: Staff\n---\n\n"]
+    length = len(parts[0])
+    while length < size:
+        r = rng.random()
+        if r < 0.1:
+            part = f"{'#' * rng.randint(1, 3)} {' '.join(rng.choices(vocab, k=4))}\n\n"
+        elif r < 0.3:
+            part = ''.join(f"- {' '.join(rng.choices(vocab, k=6))}\n" for _ in range(4)) + '\n'
+        else:
+            part = '\n'.join(' '.join(rng.choices(vocab, k=12)) for _ in range(4)) + '\n\n'
+        parts.append(part)
+        length += len(part)
+    return ''.join(parts)
+
+
+def write_corpus(directory: Path, size_mb: float, large_mb: float, seed: int = 0) -> list[Path]:
+    """Write ~size_mb of documents, including LARGE_DOCUMENTS of large_mb each."""
+    rng = random.Random(seed)
+    vocab = [f"word{i}" for i in range(2000)]
+    block = synthetic_document(rng, DOCUMENT_SIZE, vocab)
+    paths = []
+    total = 0
+    budget = size_mb * 1_000_000
+
+    large = min(LARGE_DOCUMENTS, int(budget // (large_mb * 2_000_000)))
+    for i in range(large):
+        path = directory / f"large-{i}.md"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(block)
+            body = block[block.index('\n---\n') + 5:]
+            written = len(block)
+            while written < large_mb * 1_000_000:
+                f.write(body)
+                written += len(body)
+        paths.append(path)
+        total += written
+
+    i = 0
+    while total < budget:
+        path = directory / f"doc-{i:05d}.md"
+        document = synthetic_document(rng, DOCUMENT_SIZE, vocab) if i < 50 else block
+        path.write_text(document, encoding='utf-8')
+        paths.append(path)
+        total += len(document)
+        i += 1
+    return paths
+
+
+def peak_memory(function, path: Path) -> int:
+    """Peak traced allocation in bytes while function(path) runs."""
+    tracemalloc.start()
+    function(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--size-mb', type=float, default=1024, help='Corpus size (default: 1024)')
+    parser.add_argument('--large-mb', type=float, default=128,
+                        help=f'Size of each of the {LARGE_DOCUMENTS} large documents (default: 128)')
+    parser.add_argument('--dir', type=str, help='Write the corpus here instead of a temporary directory')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        paths = write_corpus(Path(tmp), args.size_mb, args.large_mb)
+        total_mb = sum(p.stat().st_size for p in paths) / 1_000_000
+
+        for path in paths:
+            assert legacy_parse(path) == parse_document(path), f'results differ: {path.name}'
+
+        start = time.perf_counter()
+        for path in paths:
+            legacy_parse(path)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path in paths:
+            parse_document(path)
+        single = time.perf_counter() - start
+
+        largest = max(paths, key=lambda p: p.stat().st_size)
+        largest_mb = largest.stat().st_size / 1_000_000
+        legacy_peak = peak_memory(legacy_parse, largest) / 1_000_000
+        single_peak = peak_memory(parse_document, largest) / 1_000_000
+
+    print(f"Synthetic corpus:  {len(paths)} documents, {total_mb:.0f} MB")
+    print(f"Legacy helpers:    {legacy:8.2f} s  ({total_mb / legacy:6.1f} MB/s)")
+    print(f"parse_document:    {single:8.2f} s  ({total_mb / single:6.1f} MB/s)")
+    print(f"Speedup:           {legacy / single:8.2f}x")
+    print(f"Peak memory on largest document ({largest_mb:.0f} MB): "
+          f"legacy {legacy_peak:.0f} MB, parse_document {single_peak:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
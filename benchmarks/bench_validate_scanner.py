@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: validate_library.scan_module_text() against the separate
+per-module regex passes it replaced (cross-references, two marker counts,
+and a code-block strip for each of the phrase and near-duplicate checks).
+
+Builds a synthetic ~10 MB library in memory (~30 KB modules with
+references, build-time markers, and code blocks) and checks that both
+approaches return the same results before timing them.
+
+Usage:
+    python benchmarks/bench_validate_scanner.py [--size-mb 10] [--repeat 5]
+"""
+
+import re
+import sys
+import random
+import argparse
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent
+                       / 'skills' / 'building-context-libraries' / 'scripts'))
+
+from validate_library import scan_module_text  # noqa: E402
+
+
+MODULE_SIZE = 30_000
+
+
+def legacy_scan(content: str) -> dict:
+    """The pre-scanner passes, as validate_library ran them per module."""
+    matches = re.findall(r'\[([A-Z][^\]]+)\]', content)
+    references = [m for m in matches if not m.startswith('http') and '/' not in m]
+    markers = {
+        'PROPOSED': len(re.findall(r'\[PROPOSED\]', content)),
+        'HIGH-STAKES': len(re.findall(r'\[HIGH-STAKES\]', content))
+    }
+    prose = re.sub(r'```[\s\S]*?```', '', content)  # extract_key_phrases()
+    re.sub(r'```[\s\S]*?```', '', content)  # near-duplicate shingles
+    return {'references': references, 'markers': markers, 'prose': prose}
+
+
+def synthetic_library(size_mb: float, seed: int = 0) -> list[str]:
+    """Generate module bodies totalling roughly size_mb megabytes."""
+    rng = random.Random(seed)
+    vocab = [f"word{i}" for i in range(2000)]
+    modules = []
+    total = 0
+    while total < size_mb * 1_000_000:
+        parts = []
+        length = 0
+        while length < MODULE_SIZE:
+            r = rng.random()
+            if r < 0.01:
+                part = '[PROPOSED]'
+            elif r < 0.015:
+                part = '[HIGH-STAKES]'
+            elif r < 0.05:
+                part = f'See [Module {rng.randint(1, 99)}].'
+            elif r < 0.055:
+                part = '\n```\nexample [Config] block\n```\n'
+            else:
+                part = ' '.join(rng.choice(vocab) for _ in range(12)) + '.'
+            parts.append(part)
+            length += len(part) + 1
+        module = ' '.join(parts)
+        modules.append(module)
+        total += len(module)
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--size-mb', type=float, default=10, help='Library size (default: 10)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (default: 5)')
+    args = parser.parse_args()
+
+    modules = synthetic_library(args.size_mb)
+    total_mb = sum(len(m) for m in modules) / 1_000_000
+
+    for module in modules:
+        assert legacy_scan(module) == scan_module_text(module), 'results differ'
+
+    legacy = min(timeit.repeat(lambda: [legacy_scan(m) for m in modules], number=1, repeat=args.repeat))
+    scanner = min(timeit.repeat(lambda: [scan_module_text(m) for m in modules], number=1, repeat=args.repeat))
+
+    print(f"Synthetic library: {len(modules)} modules, {total_mb:.1f} MB")
+    print(f"Legacy passes:     {legacy * 1000:8.1f} ms  ({total_mb / legacy:6.1f} MB/s)")
+    print(f"scan_module_text:  {scanner * 1000:8.1f} ms  ({total_mb / scanner:6.1f} MB/s)")
+    print(f"Speedup:           {legacy / scanner:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,15 +7,22 @@ Provides:
 2. Token estimates and statistics
 3. Document structure extraction (headings, metadata)
 4. Categorization by folder/topic
-5. JSON output for programmatic use
+5. JSON output for programmatic use (or streamed NDJSON for large corpora)
 
 Usage:
-    python analyze_sources.py <SOURCE_PATH> [--json] [--output FILE]
+    python analyze_sources.py <SOURCE_PATH> [--json | --ndjson] [--jobs N] [--output FILE]
+                              [--cache FILE | --no-cache] [--hash] [--stats]
+
+Results are cached in <SOURCE_PATH>/.analyze_cache.sqlite, keyed by path,
+size and mtime, so re-runs only re-analyze new or changed documents. The
+cache is cleared when the analyzer (this script or tokenizer.py) changes.
 
 Examples:
     python analyze_sources.py ./sources
     python analyze_sources.py ./sources --json
     python analyze_sources.py ./sources --json --output inventory.json
+    python analyze_sources.py ./sources --ndjson --jobs 8 --output inventory.ndjson
+    python analyze_sources.py ./sources --stats
 """
 
 import os
@@ -23,20 +30,41 @@ import sys
 import json
 import re
 import argparse
+import hashlib
+import sqlite3
+import multiprocessing
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
-
-def count_words(text: str) -> int:
-    """Count words in text."""
-    return len(text.split())
-
-
-def estimate_tokens(text: str) -> int:
-    """Estimate tokens (roughly 0.75 words per token for English)."""
-    words = count_words(text)
-    return int(words / 0.75)
+from corpus_stats import CorpusColumns, print_stats
+from source_files import find_documents
+from timings import add_timing_arguments, finish_timings, phase, record_cache, start_timings
+import tokenizer
+from tokenizer import tokens_from_words
+
+
+CACHE_FILENAME = '.analyze_cache.sqlite'
+CACHE_SCHEMA = 2  # bump when the results table layout changes
+CACHE_BATCH = 500  # documents per cache query
+CACHED_FIELDS = ('category', 'subcategory', 'size_bytes', 'words', 'tokens_est')
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$')
+SUMMARY_LENGTH = 300
+PARSE_CHUNK_SIZE = 1 << 18  # characters read per block once line-level parsing is done
+FRONTMATTER_LIMIT = 1 << 16  # characters; a closing --- must start within this
+
+
+def find_frontmatter_end(content: str):
+    """
+    Match for the closing --- of frontmatter (searched from content[3:]), or
+    None. A closing line that starts FRONTMATTER_LIMIT characters or more
+    into the file does not count.
+    """
+    end_match = re.search(r'\n---\s*\n', content[3:])
+    if end_match and end_match.start() + 4 >= FRONTMATTER_LIMIT:
+        return None
+    return end_match
 
 
 def extract_yaml_frontmatter(content: str) -> dict:
@@ -45,7 +73,7 @@ def extract_yaml_frontmatter(content: str) -> dict:
         return {}
 
     # Find the closing ---
-    end_match = re.search(r'\n---\s*\n', content[3:])
+    end_match = find_frontmatter_end(content)
     if not end_match:
         return {}
 
@@ -80,7 +108,7 @@ def extract_first_paragraph(content: str) -> str:
     """Extract first non-empty paragraph after frontmatter and headings."""
     # Remove frontmatter
     if content.startswith('---'):
-        end_match = re.search(r'\n---\s*\n', content[3:])
+        end_match = find_frontmatter_end(content)
         if end_match:
             content = content[end_match.end() + 3:]
 
@@ -109,11 +137,156 @@ def extract_first_paragraph(content: str) -> str:
     return result
 
 
+def parse_yaml_line(line: str, metadata: dict):
+    """Add one simple `key: value` frontmatter line to metadata."""
+    if ':' in line:
+        key, value = line.split(':', 1)
+        key = key.strip()
+        value = value.strip().strip('"').strip("'")
+        if value:
+            metadata[key] = value
+
+
+def parse_heading(line: str, headings: list):
+    """Append line to headings if it is a markdown heading."""
+    match = HEADING_PATTERN.match(line)
+    if match:
+        headings.append({'level': len(match.group(1)), 'text': match.group(2).strip()})
+
+
+class ParagraphScanner:
+    """extract_first_paragraph(), fed one line at a time."""
+
+    def __init__(self):
+        self.lines = []
+        self.length = -1  # length of ' '.join(self.lines)
+        self.done = False
+
+    def feed(self, line: str):
+        stripped = line.strip()
+        if stripped and not stripped.startswith('#'):
+            self.lines.append(stripped)
+            self.length += len(stripped) + 1
+            # Later lines cannot change the truncated summary
+            self.done = self.length > SUMMARY_LENGTH
+        elif not stripped and self.lines:
+            self.done = True
+
+    def text(self) -> str:
+        result = ' '.join(self.lines)
+        if len(result) > SUMMARY_LENGTH:
+            result = result[:SUMMARY_LENGTH - 3] + '...'
+        return result
+
+
+def parse_line(line: str, counts: dict, headings: list) -> str:
+    """Count words and lines and collect a heading in one line. Returns it without its newline."""
+    counts['words'] += len(line.split())
+    counts['lines'] += len(line.splitlines())
+    text = line[:-1] if line.endswith('\n') else line
+    if text.startswith('#'):
+        parse_heading(text, headings)
+    return text
+
+
+def read_frontmatter(f) -> tuple:
+    """
+    Read the lines of a file up to and including the closing --- of its
+    frontmatter. Returns (lines, closed). The search gives up at EOF or once
+    FRONTMATTER_LIMIT characters have been read, so memory stays bounded
+    when the frontmatter is never closed.
+    """
+    line = f.readline()
+    lines = [line]
+    if not line.startswith('---'):
+        return lines, False
+    consumed = len(line)
+    while consumed < FRONTMATTER_LIMIT:
+        line = f.readline()
+        if not line:
+            break
+        lines.append(line)
+        consumed += len(line)
+        if line.startswith('---') and not line[3:].strip() and line.endswith('\n'):
+            return lines, True
+    return lines, False
+
+
+def parse_block(block: str, counts: dict, headings: list):
+    """Count words and lines and collect headings in a block of whole lines."""
+    counts['words'] += len(block.split())
+    counts['lines'] += len(block.splitlines())
+    if block.startswith('#'):
+        parse_heading(block[:block.find('\n')] if '\n' in block else block, headings)
+    start = block.find('\n#')
+    while start != -1:
+        end = block.find('\n', start + 1)
+        parse_heading(block[start + 1:end] if end != -1 else block[start + 1:], headings)
+        start = block.find('\n#', start + 1)
+
+
+def parse_document(filepath: Path) -> dict:
+    """
+    Single streaming pass producing the same words, lines, metadata,
+    headings and summary as the separate extract_* helpers.
+
+    The frontmatter is read ahead (at most FRONTMATTER_LIMIT characters),
+    then lines are read one at a time until the first paragraph is settled,
+    and the rest of the file is read in blocks of whole lines, so memory
+    stays bounded by the block size and the longest line.
+    """
+    counts = {'words': 0, 'lines': 0}
+    headings = []
+    metadata = {}
+    paragraph = ParagraphScanner()
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        lines, closed = read_frontmatter(f)
+        if closed:
+            # The summary starts after the closing ---
+            parse_yaml_line(parse_line(lines[0], counts, headings)[3:], metadata)
+            for line in lines[1:-1]:
+                parse_yaml_line(parse_line(line, counts, headings), metadata)
+            parse_line(lines[-1], counts, headings)
+            lines = []
+        # Without a closing ---, the summary starts at the top of the file
+        for line in lines:
+            text = parse_line(line, counts, headings)
+            if not paragraph.done:
+                paragraph.feed(text)
+
+        while not paragraph.done:
+            line = f.readline()
+            if not line:
+                break
+            paragraph.feed(parse_line(line, counts, headings))
+
+        # Headings, words and lines only from here on
+        carry = []
+        for block in iter(lambda: f.read(PARSE_CHUNK_SIZE), ''):
+            cut = block.rfind('\n') + 1
+            if not cut:
+                carry.append(block)
+                continue
+            parse_block(''.join(carry) + block[:cut], counts, headings)
+            carry = [block[cut:]]
+        rest = ''.join(carry)
+        if rest:
+            parse_block(rest, counts, headings)
+
+    return {
+        'words': counts['words'],
+        'lines': counts['lines'],
+        'metadata': metadata,
+        'headings': headings,
+        'summary': paragraph.text(),
+    }
+
+
 def analyze_file(filepath: Path, base_dir: Path) -> dict:
     """Analyze a single file comprehensively."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        parsed = parse_document(filepath)
 
         # Get relative path from base
         rel_path = filepath.relative_to(base_dir)
@@ -122,6 +295,8 @@ def analyze_file(filepath: Path, base_dir: Path) -> dict:
         parts = rel_path.parts
         category = parts[0] if len(parts) > 1 else 'root'
         subcategory = parts[1] if len(parts) > 2 else None
+        words = parsed['words']
+        stat = filepath.stat()
 
         return {
             'path': str(filepath),
@@ -129,14 +304,14 @@ def analyze_file(filepath: Path, base_dir: Path) -> dict:
             'name': filepath.name,
             'category': category,
             'subcategory': subcategory,
-            'size_bytes': filepath.stat().st_size,
-            'words': count_words(content),
-            'tokens_est': estimate_tokens(content),
-            'lines': len(content.splitlines()),
-            'metadata': extract_yaml_frontmatter(content),
-            'headings': extract_headings(content),
-            'summary': extract_first_paragraph(content),
-            'modified': datetime.fromtimestamp(filepath.stat().st_mtime).isoformat(),
+            'size_bytes': stat.st_size,
+            'words': words,
+            'tokens_est': tokens_from_words(words),
+            'lines': parsed['lines'],
+            'metadata': parsed['metadata'],
+            'headings': parsed['headings'],
+            'summary': parsed['summary'],
+            'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
             'error': None
         }
     except Exception as e:
@@ -147,20 +322,297 @@ def analyze_file(filepath: Path, base_dir: Path) -> dict:
         }
 
 
-def find_documents(source_dir: Path) -> list:
-    """Find all markdown and text documents."""
-    extensions = {'.md', '.txt', '.markdown'}
-    documents = []
+def analyze_files(documents: list, base_dir: Path, jobs: int = 1, start_method: str | None = None):
+    """
+    Yield analyze_file() results in document order.
+
+    With jobs > 1, files are analyzed on a process pool and each result is
+    yielded as soon as it (and every result before it) is ready, so callers
+    can stream output instead of waiting for the whole corpus. start_method
+    picks the multiprocessing start method for the pool (default: the
+    platform's); callers running other threads should pass 'spawn'.
+    """
+    if jobs > 1 and len(documents) > 1:
+        chunksize = max(1, min(64, len(documents) // (jobs * 8)))
+        with multiprocessing.get_context(start_method).Pool(jobs) as pool:
+            yield from pool.imap(partial(analyze_file, base_dir=base_dir), documents, chunksize)
+    else:
+        for doc in documents:
+            yield analyze_file(doc, base_dir)
+
+
+def file_digest(filepath: Path) -> str:
+    """SHA-256 of a file's bytes, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CachedResult(dict):
+    """
+    Summary fields of a cached analyze_file() result (CACHED_FIELDS plus
+    path), for callers that only total or tabulate results. The full record
+    is kept as the JSON text it was stored as, without 'path'.
+    """
+
+    __slots__ = ('document_json',)
+
+
+class AnalysisCache:
+    """
+    Persistent analyze_file() results keyed by relative path, size and mtime_ns.
+
+    With use_hash, a file whose size or mtime changed but whose content hash
+    did not (a touch, a fresh checkout) is also served from the cache.
+    Entries for files that were not seen during a run are dropped on save.
+
+    Rows are looked up in batches as documents are checked and yielded, so
+    the cache is never loaded into memory as a whole. The cache is emptied
+    when CACHE_SCHEMA or the analyzer's code changes.
+    """
+
+    def __init__(self, path: Path, use_hash: bool = False):
+        self.path = Path(path)
+        self.use_hash = use_hash
+        self.conn = sqlite3.connect(str(self.path))
+        self._prepare()
+        self.conn.execute('CREATE TEMP TABLE seen (path TEXT PRIMARY KEY)')
+        self.keys = {}  # str(filepath) -> (rel_path, size, mtime_ns, sha256), for misses only
+        self.hit_flags = bytearray()  # per document, in check() order
+        self.hits = 0
+        self.misses = 0
+
+    def _prepare(self):
+        """Create the tables, discarding rows written by another schema or analyzer."""
+        conn = self.conn
+        conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        meta = dict(conn.execute('SELECT key, value FROM meta'))
+        fingerprint = analyzer_fingerprint()
+        if meta.get('schema') != str(CACHE_SCHEMA):
+            conn.execute('DROP TABLE IF EXISTS results')
+        elif meta.get('analyzer') != fingerprint:
+            conn.execute('DELETE FROM results')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT, '
+            'category TEXT, subcategory TEXT, size_bytes INTEGER, words INTEGER, tokens_est INTEGER, '
+            'result TEXT)'
+        )
+        conn.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                         [('schema', str(CACHE_SCHEMA)), ('analyzer', fingerprint)])
+        conn.commit()
+
+    def _rows(self, columns: str, rel_paths: list) -> dict:
+        """rel_path -> row (without the path) for the cached rel_paths."""
+        placeholders = ','.join('?' * len(rel_paths))
+        return {
+            row[0]: row[1:] for row in self.conn.execute(
+                f'SELECT path, {columns} FROM results WHERE path IN ({placeholders})', rel_paths
+            )
+        }
 
-    for ext in extensions:
-        documents.extend(source_dir.rglob(f'*{ext}'))
+    def _write(self, rel_path: str, key: tuple, result: dict):
+        record = {k: v for k, v in result.items() if k != 'path'}
+        self.conn.execute(
+            'INSERT OR REPLACE INTO results (path, size, mtime_ns, sha256, category, subcategory, '
+            'size_bytes, words, tokens_est, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (rel_path, *key, *(result[field] for field in CACHED_FIELDS), json.dumps(record))
+        )
+
+    def check(self, documents: list, base_dir: Path) -> list:
+        """
+        Stat every document and compare it with its cached key, a batch at a
+        time. Returns the documents that need analyzing, in order.
+        """
+        base = str(base_dir)
+        fresh = []
+        for i in range(0, len(documents), CACHE_BATCH):
+            batch = documents[i:i + CACHE_BATCH]
+            doc_paths = [str(doc) for doc in batch]
+            rel_paths = [relative_path(doc_path, base) for doc_path in doc_paths]
+            self.conn.executemany('INSERT OR IGNORE INTO temp.seen (path) VALUES (?)',
+                                  [(rel_path,) for rel_path in rel_paths])
+            cached = self._rows('size, mtime_ns, sha256', rel_paths)
+            for doc, doc_path, rel_path in zip(batch, doc_paths, rel_paths):
+                if self._is_current(doc_path, rel_path, cached.get(rel_path)):
+                    self.hit_flags.append(1)
+                    self.hits += 1
+                else:
+                    self.hit_flags.append(0)
+                    self.misses += 1
+                    fresh.append(doc)
+        return fresh
+
+    def _is_current(self, doc_path: str, rel_path: str, previous: tuple | None) -> bool:
+        try:
+            stat = os.stat(doc_path)
+        except OSError:
+            return False
+        key = (stat.st_size, stat.st_mtime_ns)
+        if previous and previous[:2] == key:
+            return True
+        digest = previous[2] if previous else None
+        if self.use_hash:
+            try:
+                digest = file_digest(doc_path)
+            except OSError:
+                digest = None
+            if previous and digest is not None and digest == previous[2]:
+                # Same content: keep the result under the new size/mtime
+                result = json.loads(self._rows('result', [rel_path])[rel_path][0])
+                result['modified'] = datetime.fromtimestamp(stat.st_mtime).isoformat()
+                self._write(rel_path, (*key, digest), result)
+                return True
+        self.keys[doc_path] = (rel_path, *key, digest)
+        return False
+
+    def fetch(self, start: int, documents: list, base_dir: Path, summary_only: bool = False) -> list:
+        """
+        Cached results for documents, which begin at position start of the
+        check() list: one per document, None where it must be analyzed.
+        With summary_only, results are CachedResult records.
+        """
+        base = str(base_dir)
+        paths = {}  # rel_path -> (position in documents, str(filepath))
+        for i, doc in enumerate(documents):
+            if self.hit_flags[start + i]:
+                doc_path = str(doc)
+                paths[relative_path(doc_path, base)] = (i, doc_path)
+
+        results = [None] * len(documents)
+        if not paths:
+            return results
+        if summary_only:
+            rows = self._rows(', '.join(CACHED_FIELDS) + ', result', list(paths))
+            for rel_path, row in rows.items():
+                i, doc_path = paths[rel_path]
+                result = CachedResult(zip(CACHED_FIELDS, row[:-1]), path=doc_path)
+                result['relative_path'] = rel_path
+                result['error'] = None
+                result.document_json = row[-1]
+                results[i] = result
+        else:
+            for rel_path, (document_json,) in self._rows('result', list(paths)).items():
+                i, doc_path = paths[rel_path]
+                result = {'path': doc_path}
+                result.update(json.loads(document_json))
+                results[i] = result
+        return results
+
+    def store(self, filepath: Path, result: dict):
+        """Remember a fresh result under the size/mtime seen by check()."""
+        key = self.keys.pop(str(filepath), None)
+        if key is None or result.get('error'):
+            return
+        self._write(key[0], key[1:], result)
+
+    def save(self):
+        """Commit new results and drop entries for files that no longer exist."""
+        with self.conn:
+            self.conn.execute('DELETE FROM results WHERE path NOT IN (SELECT path FROM temp.seen)')
+        self.conn.close()
+
+
+def relative_path(path: str, base: str) -> str:
+    """path relative to base, for path strings of documents found under base."""
+    if base == '.':
+        return path
+    if path.startswith(base) and path[len(base):len(base) + 1] == os.sep:
+        return path[len(base) + 1:]
+    return str(Path(path).relative_to(base))
+
+
+def analyzer_fingerprint() -> str:
+    """Hash of the code that produces analyze_file() results."""
+    digest = hashlib.sha256()
+    for module in (__file__, tokenizer.__file__):
+        with open(module, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def analyze_cached(documents: list, base_dir: Path, cache: AnalysisCache, jobs: int = 1,
+                   start_method: str | None = None, summary_only: bool = False):
+    """
+    Yield results in document order, re-analyzing only files the cache
+    cannot answer for. Fresh results are added to the cache, which is
+    saved once every document has been yielded.
+
+    Cached results are read a batch at a time as they are yielded, so
+    memory does not grow with the corpus. With summary_only, cache hits are
+    CachedResult records, which skip decoding the stored JSON.
+    """
+    fresh = analyze_files(cache.check(documents, base_dir), base_dir, jobs, start_method)
+    for start in range(0, len(documents), CACHE_BATCH):
+        batch = documents[start:start + CACHE_BATCH]
+        cached = cache.fetch(start, batch, base_dir, summary_only)
+        for doc, result in zip(batch, cached):
+            if result is None:
+                result = next(fresh)
+                cache.store(doc, result)
+            yield result
+    cache.save()
+    print(f"Analysis cache: {cache.path} ({cache.hits} hits, {cache.misses} misses)",
+          file=sys.stderr)
+
+
+def counted(results, record: dict):
+    """Pass results through, adding their file and byte counts to a timing record."""
+    for result in results:
+        record['files'] += 1
+        record['bytes'] += result.get('size_bytes', 0)
+        yield result
+
+
+def summarize(total_documents: int, total_words: int, total_tokens: int) -> dict:
+    """Corpus totals and library size estimate."""
+    return {
+        'total_documents': total_documents,
+        'total_words': total_words,
+        'total_tokens_est': total_tokens,
+        'estimated_library_size_min': int(total_tokens * 0.2),
+        'estimated_library_size_max': int(total_tokens * 0.4),
+    }
+
+
+def write_ndjson(results, source_dir: Path, out, columns: CorpusColumns | None = None) -> dict:
+    """
+    Write one JSON record per document as results arrive, then a summary record.
+    Only running totals (and, when given, the statistics columns) are kept in
+    memory. Returns the summary.
+    """
+    total_documents = 0
+    total_words = 0
+    total_tokens = 0
 
-    # Filter out hidden files and common non-content files
-    documents = [d for d in documents if not any(
-        part.startswith('.') for part in d.parts
-    )]
+    for result in results:
+        if isinstance(result, CachedResult):
+            # Splice the stored JSON instead of decoding and re-encoding it
+            out.write('{"type": "document", "path": ' + json.dumps(result['path']) + ', '
+                      + result.document_json[1:] + '\n')
+        else:
+            out.write(json.dumps({'type': 'document', **result}) + '\n')
+        out.flush()
+        if columns is not None:
+            columns.add(result)
+        total_documents += 1
+        if not result.get('error'):
+            total_words += result['words']
+            total_tokens += result['tokens_est']
 
-    return sorted(documents)
+    summary = summarize(total_documents, total_words, total_tokens)
+    record = {
+        'type': 'summary',
+        'analysis_date': datetime.now().isoformat(),
+        'source_directory': str(source_dir.absolute()),
+        'summary': summary,
+    }
+    if columns is not None:
+        record['stats'] = columns.compute()
+    out.write(json.dumps(record) + '\n')
+    return summary
 
 
 def print_text_report(results: list, source_dir: Path, total_tokens: int, total_words: int):
@@ -256,10 +708,25 @@ def main():
     )
     parser.add_argument('source_dir', nargs='?', default='.',
                        help='Directory containing source documents')
-    parser.add_argument('--json', action='store_true',
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument('--json', action='store_true',
                        help='Output as JSON instead of text')
+    output_format.add_argument('--ndjson', action='store_true',
+                       help='Stream newline-delimited JSON: one record per document, summary last')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Analyze files on N worker processes (default: 1)')
+    parser.add_argument('--cache', type=str,
+                       help=f'Analysis cache file (default: <source_dir>/{CACHE_FILENAME})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Analyze every document without reading or writing the cache')
+    parser.add_argument('--hash', action='store_true',
+                       help='Also reuse cached results for files whose content hash is unchanged')
+    parser.add_argument('--stats', action='store_true',
+                       help='Report corpus statistics (per-category totals and percentiles, '
+                            'size histogram, largest documents) instead of the document list')
     parser.add_argument('--output', '-o', type=str,
                        help='Write output to file instead of stdout')
+    add_timing_arguments(parser)
 
     args = parser.parse_args()
     source_dir = Path(args.source_dir)
@@ -268,56 +735,99 @@ def main():
         print(f"Error: Directory '{source_dir}' not found", file=sys.stderr)
         sys.exit(1)
 
-    documents = find_documents(source_dir)
+    start_timings('analyze_sources', args)
+    with phase('discover') as record:
+        documents = find_documents(source_dir)
+        record['files'] = len(documents)
 
     if not documents:
         print(f"No documents found in '{source_dir}'", file=sys.stderr)
         print("Looking for: .md, .txt, .markdown files", file=sys.stderr)
+        finish_timings()
         sys.exit(0)
 
+    cache = None
+    if not args.no_cache:
+        cache_path = Path(args.cache) if args.cache else source_dir / CACHE_FILENAME
+        try:
+            cache = AnalysisCache(cache_path, use_hash=args.hash)
+        except sqlite3.Error as e:
+            print(f"Warning: analysis cache unavailable ({e}); analyzing all documents",
+                  file=sys.stderr)
+
+    if cache:
+        # Only --ndjson and --stats without --json skip the full cached records
+        summary_only = args.ndjson or (args.stats and not args.json)
+        results = analyze_cached(documents, source_dir, cache, args.jobs, summary_only=summary_only)
+    else:
+        results = analyze_files(documents, source_dir, args.jobs)
+
+    columns = CorpusColumns() if args.stats else None
+
+    # Stream records straight to the destination without collecting them
+    if args.ndjson:
+        with phase('analyze') as record:
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    write_ndjson(counted(results, record), source_dir, f, columns)
+                print(f"Output written to {args.output}", file=sys.stderr)
+            else:
+                write_ndjson(counted(results, record), source_dir, sys.stdout, columns)
+        if cache:
+            record_cache('analysis', cache.hits, cache.misses)
+        finish_timings()
+        return
+
     # Analyze all documents
-    results = []
+    with phase('analyze') as record:
+        results = list(counted(results, record))
+    if cache:
+        record_cache('analysis', cache.hits, cache.misses)
+
     total_words = 0
     total_tokens = 0
 
-    for doc in documents:
-        result = analyze_file(doc, source_dir)
-        results.append(result)
+    for result in results:
         if not result.get('error'):
             total_words += result['words']
             total_tokens += result['tokens_est']
+        if columns is not None:
+            columns.add(result)
+
+    with phase('report'):
+        # Prepare output
+        if args.json:
+            output = {
+                'analysis_date': datetime.now().isoformat(),
+                'source_directory': str(source_dir.absolute()),
+                'summary': summarize(len(results), total_words, total_tokens),
+                'documents': results
+            }
+            if columns is not None:
+                output['stats'] = columns.compute()
+            output_str = json.dumps(output, indent=2)
+        else:
+            # Capture text output
+            import io
+            old_stdout = sys.stdout
+            sys.stdout = io.StringIO()
+            if columns is not None:
+                print(f"Directory: {source_dir.absolute()}\n")
+                print_stats(columns.compute())
+            else:
+                print_text_report(results, source_dir, total_tokens, total_words)
+            output_str = sys.stdout.getvalue()
+            sys.stdout = old_stdout
+
+        # Write output
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output_str)
+            print(f"Output written to {args.output}", file=sys.stderr)
+        else:
+            print(output_str)
 
-    # Prepare output
-    if args.json:
-        output = {
-            'analysis_date': datetime.now().isoformat(),
-            'source_directory': str(source_dir.absolute()),
-            'summary': {
-                'total_documents': len(results),
-                'total_words': total_words,
-                'total_tokens_est': total_tokens,
-                'estimated_library_size_min': int(total_tokens * 0.2),
-                'estimated_library_size_max': int(total_tokens * 0.4),
-            },
-            'documents': results
-        }
-        output_str = json.dumps(output, indent=2)
-    else:
-        # Capture text output
-        import io
-        old_stdout = sys.stdout
-        sys.stdout = io.StringIO()
-        print_text_report(results, source_dir, total_tokens, total_words)
-        output_str = sys.stdout.getvalue()
-        sys.stdout = old_stdout
-
-    # Write output
-    if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(output_str)
-        print(f"Output written to {args.output}", file=sys.stderr)
-    else:
-        print(output_str)
+    finish_timings()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,248 @@
+"""
+Corpus statistics for analyze_sources.py --stats.
+
+Per-document results are collected into columns (category and subcategory
+codes, tokens, bytes) and aggregated in bulk: totals per group,
+nearest-rank percentiles, power-of-two size histograms, and the largest
+documents. NumPy is used when it is installed; otherwise the same results
+are computed from stdlib arrays.
+
+Usage (from another script):
+    from corpus_stats import CorpusColumns, print_stats
+    columns = CorpusColumns()
+    for result in results:
+        columns.add(result)
+    print_stats(columns.compute())
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+PERCENTILES = (50, 90, 99)
+TOP_DOCUMENTS = 10
+
+
+def _rank(count, p):
+    """Nearest-rank index (0-based) of percentile p among count sorted values."""
+    return (p * count + 99) // 100 - 1
+
+
+class CorpusColumns:
+    """Columnar store of analyze_file() results."""
+
+    def __init__(self):
+        self.categories = {}  # category -> code
+        self.subcategories = {}  # (category, subcategory) -> code
+        self.category_codes = array('q')
+        self.subcategory_codes = array('q')
+        self.tokens = array('q')
+        self.sizes = array('q')
+        self.paths = []
+        self.errors = 0
+
+    def add(self, result: dict):
+        if result.get('error'):
+            self.errors += 1
+            return
+        category = result['category']
+        key = (category, result['subcategory'] or '')
+        self.category_codes.append(self.categories.setdefault(category, len(self.categories)))
+        self.subcategory_codes.append(self.subcategories.setdefault(key, len(self.subcategories)))
+        self.tokens.append(result['tokens_est'])
+        self.sizes.append(result['size_bytes'])
+        self.paths.append(result['relative_path'])
+
+    def compute(self, top: int = TOP_DOCUMENTS, use_numpy: bool | None = None) -> dict:
+        """Aggregate the columns. use_numpy=False forces the stdlib path."""
+        if use_numpy is None:
+            use_numpy = np is not None
+        aggregate = _aggregate_numpy if use_numpy else _aggregate_stdlib
+        return aggregate(self, top)
+
+
+def _group_rows(names, totals, percentiles, total_tokens):
+    """Build per-group rows from parallel per-code lists, largest first."""
+    rows = []
+    for name, code in names.items():
+        documents, tokens, size = totals[code]
+        row = {'documents': documents, 'tokens': tokens, 'bytes': size,
+               'share': tokens / total_tokens if total_tokens else 0.0}
+        row.update(percentiles[code])
+        if isinstance(name, tuple):
+            rows.append({'category': name[0], 'subcategory': name[1], **row})
+        else:
+            rows.append({'category': name, **row})
+    rows.sort(key=lambda r: (-r['tokens'], r['category'], r.get('subcategory', '')))
+    return rows
+
+
+def _summary(documents, errors, total_tokens, total_bytes, overall, histogram, largest):
+    return {
+        'documents': documents,
+        'errors': errors,
+        'total_tokens': total_tokens,
+        'total_bytes': total_bytes,
+        'mean_tokens': total_tokens / documents if documents else 0.0,
+        'tokens': overall,
+        'by_category': [],
+        'by_subcategory': [],
+        'histogram': histogram,
+        'largest': largest,
+    }
+
+
+def _histogram_rows(counts, token_sums):
+    """Rows for power-of-two token bins; bin b holds 2**(b-1) .. 2**b - 1 tokens."""
+    rows = []
+    for b, (count, tokens) in enumerate(zip(counts, token_sums)):
+        if count:
+            rows.append({'min_tokens': 0 if b == 0 else 1 << (b - 1),
+                         'max_tokens': 0 if b == 0 else (1 << b) - 1,
+                         'documents': count, 'tokens': tokens})
+    return rows
+
+
+def _aggregate_numpy(columns: CorpusColumns, top: int) -> dict:
+    tokens = np.frombuffer(columns.tokens, dtype=np.int64) if columns.tokens else np.zeros(0, np.int64)
+    sizes = np.frombuffer(columns.sizes, dtype=np.int64) if columns.sizes else np.zeros(0, np.int64)
+    n = len(tokens)
+    if not n:
+        return _summary(0, columns.errors, 0, 0, {}, [], [])
+
+    def by_group(codes_array, names):
+        codes = np.frombuffer(codes_array, dtype=np.int64)
+        k = len(names)
+        counts = np.bincount(codes, minlength=k)
+        token_totals = np.bincount(codes, weights=tokens, minlength=k)
+        size_totals = np.bincount(codes, weights=sizes, minlength=k)
+        # Sort by group, then tokens: each group is a contiguous sorted run
+        ordered = tokens[np.lexsort((tokens, codes))]
+        starts = np.cumsum(counts) - counts
+        percentiles = [{} for _ in range(k)]
+        for p in PERCENTILES:
+            values = ordered[starts + (p * counts + 99) // 100 - 1]
+            for code in range(k):
+                percentiles[code][f'p{p}'] = int(values[code])
+        maxima = ordered[starts + counts - 1]
+        for code in range(k):
+            percentiles[code]['max'] = int(maxima[code])
+        totals = [(int(c), int(t), int(s)) for c, t, s in zip(counts, token_totals, size_totals)]
+        return totals, percentiles
+
+    total_tokens = int(tokens.sum())
+    category_totals, category_percentiles = by_group(columns.category_codes, columns.categories)
+    sub_totals, sub_percentiles = by_group(columns.subcategory_codes, columns.subcategories)
+
+    ordered = np.sort(tokens)
+    overall = {f'p{p}': int(ordered[_rank(n, p)]) for p in PERCENTILES}
+    overall['max'] = int(ordered[-1])
+
+    bins = np.frexp(tokens.astype(np.float64))[1]
+    histogram = _histogram_rows(np.bincount(bins).tolist(),
+                                np.bincount(bins, weights=tokens).astype(np.int64).tolist())
+
+    largest = [{'path': columns.paths[i], 'tokens': int(tokens[i]), 'bytes': int(sizes[i])}
+               for i in np.argsort(-tokens, kind='stable')[:top]]
+
+    stats = _summary(n, columns.errors, total_tokens, int(sizes.sum()), overall, histogram, largest)
+    stats['by_category'] = _group_rows(columns.categories, category_totals,
+                                       category_percentiles, total_tokens)
+    stats['by_subcategory'] = _group_rows(columns.subcategories, sub_totals,
+                                          sub_percentiles, total_tokens)
+    return stats
+
+
+def _aggregate_stdlib(columns: CorpusColumns, top: int) -> dict:
+    tokens = columns.tokens
+    sizes = columns.sizes
+    n = len(tokens)
+    if not n:
+        return _summary(0, columns.errors, 0, 0, {}, [], [])
+
+    def by_group(codes, names):
+        k = len(names)
+        groups = [array('q') for _ in range(k)]
+        size_totals = [0] * k
+        for code, t, s in zip(codes, tokens, sizes):
+            groups[code].append(t)
+            size_totals[code] += s
+        totals = []
+        percentiles = []
+        for code, values in enumerate(groups):
+            values = sorted(values)
+            totals.append((len(values), sum(values), size_totals[code]))
+            row = {f'p{p}': values[_rank(len(values), p)] for p in PERCENTILES}
+            row['max'] = values[-1]
+            percentiles.append(row)
+        return totals, percentiles
+
+    total_tokens = sum(tokens)
+    category_totals, category_percentiles = by_group(columns.category_codes, columns.categories)
+    sub_totals, sub_percentiles = by_group(columns.subcategory_codes, columns.subcategories)
+
+    ordered = sorted(tokens)
+    overall = {f'p{p}': ordered[_rank(n, p)] for p in PERCENTILES}
+    overall['max'] = ordered[-1]
+
+    width = ordered[-1].bit_length() + 1
+    counts = [0] * width
+    token_sums = [0] * width
+    for t in tokens:
+        b = t.bit_length()
+        counts[b] += 1
+        token_sums[b] += t
+    histogram = _histogram_rows(counts, token_sums)
+
+    largest = [{'path': columns.paths[i], 'tokens': tokens[i], 'bytes': sizes[i]}
+               for i in sorted(range(n), key=tokens.__getitem__, reverse=True)[:top]]
+
+    stats = _summary(n, columns.errors, total_tokens, sum(sizes), overall, histogram, largest)
+    stats['by_category'] = _group_rows(columns.categories, category_totals,
+                                       category_percentiles, total_tokens)
+    stats['by_subcategory'] = _group_rows(columns.subcategories, sub_totals,
+                                          sub_percentiles, total_tokens)
+    return stats
+
+
+def print_stats(stats: dict):
+    """Print a human-readable statistics report."""
+    print("Corpus Statistics")
+    print("=================")
+    print(f"Documents: {stats['documents']:,}" +
+          (f" ({stats['errors']:,} unreadable)" if stats['errors'] else ""))
+    print(f"Total tokens (est): {stats['total_tokens']:,}")
+    print(f"Total size: {stats['total_bytes'] / 1_000_000:,.1f} MB")
+    if not stats['documents']:
+        return
+
+    overall = stats['tokens']
+    print(f"Tokens per document: mean {stats['mean_tokens']:,.0f} | "
+          f"p50 {overall['p50']:,} | p90 {overall['p90']:,} | "
+          f"p99 {overall['p99']:,} | max {overall['max']:,}")
+
+    def print_groups(title, rows, label):
+        print(f"\n## {title}")
+        print(f"  {'':<36} {'docs':>8} {'tokens':>12} {'share':>6} {'p50':>8} {'p90':>8} {'max':>9}")
+        for row in rows:
+            print(f"  {label(row)[:36]:<36} {row['documents']:>8,} {row['tokens']:>12,} "
+                  f"{row['share']:>6.1%} {row['p50']:>8,} {row['p90']:>8,} {row['max']:>9,}")
+
+    print_groups('By category', stats['by_category'], lambda r: f"{r['category']}/")
+    print_groups('By subcategory', stats['by_subcategory'],
+                 lambda r: f"{r['category']}/{r['subcategory']}/" if r['subcategory'] else f"{r['category']}/")
+
+    print("\n## Size distribution (tokens per document)")
+    most = max(row['documents'] for row in stats['histogram'])
+    for row in stats['histogram']:
+        bar = '#' * max(1, round(40 * row['documents'] / most))
+        print(f"  {row['min_tokens']:>9,} - {row['max_tokens']:>9,}  {row['documents']:>8,}  {bar}")
+
+    print(f"\n## Largest documents")
+    for row in stats['largest']:
+        share = row['tokens'] / stats['total_tokens'] if stats['total_tokens'] else 0.0
+        print(f"  {row['tokens']:>10,} tokens ({share:5.1%})  {row['path']}")
@@ -5,28 +5,41 @@ Count tokens in context library modules and calculate agent budgets.
 The per-agent module budget is 10% of the target model's context window.
 Addenda are excluded from token counts — they are loaded on demand.
 
+Token counts default to a words / 0.75 heuristic. Pass --vocab with a local
+tiktoken-format BPE vocabulary for exact counts; BPE results are cached by
+content hash in <library_dir>/.token_cache.json.
+
 Usage:
-    python count_tokens.py <library_dir> [agents_dir] [--context-window N]
+    python count_tokens.py <library_dir> [agents_dir] [--context-window N] [--vocab FILE] [--json] [--watch]
 
 Examples:
     python count_tokens.py ./modules ./agents
     python count_tokens.py ./modules ./agents --context-window 200000
+    python count_tokens.py ./modules ./agents --vocab ./cl100k_base.tiktoken
+    python count_tokens.py ./modules ./agents --json > budgets.json
+    python count_tokens.py ./modules ./agents --watch
 """
 
 import sys
+import json
+import time
 import argparse
 import yaml
+from array import array
+from datetime import datetime
 from pathlib import Path
 
+from tokenizer import HeuristicTokenizer, TokenCache, load_tokenizer
+from timings import add_timing_arguments, start_timings, finish_timings, phase, record_cache
+from watch import watch_files
+
 
 DEFAULT_CONTEXT_WINDOW = 200000  # Claude Sonnet 4.5
 BUDGET_PERCENTAGE = 0.10  # 10% of context window
+CACHE_FILENAME = '.token_cache.json'
 
-
-def estimate_tokens(text: str) -> int:
-    """Estimate tokens (roughly 0.75 words per token for English)."""
-    words = len(text.split())
-    return int(words / 0.75)
+# libyaml's C loader when available; same results as safe_load, much faster
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 
 def parse_frontmatter(content: str) -> tuple:
@@ -35,7 +48,7 @@ def parse_frontmatter(content: str) -> tuple:
         parts = content.split('---', 2)
         if len(parts) >= 3:
             try:
-                frontmatter = yaml.safe_load(parts[1])
+                frontmatter = yaml.load(parts[1], Loader=YAML_LOADER)
                 body = parts[2]
                 return frontmatter, body
             except yaml.YAMLError:
@@ -43,13 +56,23 @@ def parse_frontmatter(content: str) -> tuple:
     return {}, content
 
 
-def analyze_module(filepath: Path) -> dict:
+def analyze_module(filepath: Path, tokenizer=None, cache: TokenCache | None = None) -> dict:
     """Analyze a single module file."""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
-
         frontmatter, body = parse_frontmatter(content)
+    except Exception as e:
+        return {'path': str(filepath), 'name': filepath.stem, 'error': str(e)}
+    return module_result(filepath, content, frontmatter, tokenizer, cache)
+
+
+def module_result(filepath: Path, content: str, frontmatter: dict,
+                  tokenizer=None, cache: TokenCache | None = None) -> dict:
+    """Token count record for a module whose content is already loaded."""
+    try:
+        tokenizer = tokenizer or HeuristicTokenizer()
+        tokens = cache.count(tokenizer, content, filepath) if cache else tokenizer.count(content)
 
         return {
             'path': str(filepath),
@@ -57,7 +80,7 @@ def analyze_module(filepath: Path) -> dict:
             'module_id': frontmatter.get('module_id', filepath.stem),
             'module_name': frontmatter.get('module_name', filepath.stem),
             'tier': frontmatter.get('tier', 'unknown'),
-            'tokens': estimate_tokens(content),
+            'tokens': tokens,
             'error': None
         }
     except Exception as e:
@@ -73,9 +96,15 @@ def analyze_agent(filepath: Path) -> dict:
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
-
         frontmatter, body = parse_frontmatter(content)
+    except Exception as e:
+        return {'path': str(filepath), 'name': filepath.stem, 'error': str(e)}
+    return agent_result(filepath, frontmatter)
+
 
+def agent_result(filepath: Path, frontmatter: dict) -> dict:
+    """Module list record for an agent definition whose frontmatter is already parsed."""
+    try:
         modules = frontmatter.get('modules', {})
         all_modules = []
         for tier_modules in modules.values():
@@ -107,34 +136,121 @@ def find_modules(library_dir: Path) -> list:
     return modules
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description='Count tokens in context library modules and calculate agent budgets.'
-    )
-    parser.add_argument('library_dir',
-                       help='Path to library/ folder with modules')
-    parser.add_argument('agents_dir', nargs='?',
-                       help='Optional path to agents/ folder')
-    parser.add_argument('--context-window', type=int, default=DEFAULT_CONTEXT_WINDOW,
-                       help=f'Target model context window in tokens (default: {DEFAULT_CONTEXT_WINDOW:,})')
-
-    args = parser.parse_args()
-    library_dir = Path(args.library_dir)
-    agents_dir = Path(args.agents_dir) if args.agents_dir else None
-    token_limit = int(args.context_window * BUDGET_PERCENTAGE)
+def build_module_index(modules: dict) -> tuple[dict, array]:
+    """
+    Index modules by module_id and file stem in one pass.
+
+    Returns (index, tokens): index maps each key to a position in the
+    tokens array. When keys collide, the earlier module wins, matching a
+    first-match scan over modules.
+    """
+    index = {}
+    tokens = array('q')
+    for module_id, mdata in modules.items():
+        position = len(tokens)
+        tokens.append(mdata['tokens'])
+        index.setdefault(module_id, position)
+        index.setdefault(mdata['name'], position)
+    return index, tokens
+
+
+def calculate_agent_budget(agent: dict, index: dict, tokens: array, token_limit: int) -> dict:
+    """
+    Sum module tokens for an agent and classify it against the budget.
+    Module references that are not strings (a mapping or list written in the
+    agent's frontmatter) cannot name a module and are reported as missing.
+    """
+    positions = []
+    missing_modules = []
+    for mod_id in agent['modules']:
+        if isinstance(mod_id, str) and mod_id in index:
+            positions.append(index[mod_id])
+        else:
+            missing_modules.append(mod_id)
+    agent_tokens = sum(map(tokens.__getitem__, positions))
+
+    pct = (agent_tokens / token_limit) * 100
+    status = "OK" if agent_tokens < token_limit else "OVER"
+    if pct > 80:
+        status = "WARN" if status == "OK" else status
+
+    return {
+        'path': agent['path'],
+        'name': agent['name'],
+        'tokens': agent_tokens,
+        'percent': round(pct, 1),
+        'status': status,
+        'missing': missing_modules,
+        'stated_tokens': agent.get('stated_tokens'),
+        'error': None
+    }
+
+
+def summarize_budgets(module_results: list, agent_results: list | None, context_window: int,
+                      tokenizer, cache: TokenCache | None = None) -> dict:
+    """Total module tokens and compute agent budgets from analyzed files."""
+    token_limit = int(context_window * BUDGET_PERCENTAGE)
 
-    if not library_dir.exists():
-        print(f"Error: Library directory '{library_dir}' not found")
-        sys.exit(1)
+    modules = {}
+    total_tokens = 0
+    for result in module_results:
+        if not result.get('error'):
+            modules[result['module_id']] = result
+            total_tokens += result['tokens']
 
+    agents = None
+    if agent_results is not None:
+        index, tokens = build_module_index(modules)
+        agents = []
+        for agent in agent_results:
+            if agent.get('error'):
+                agents.append(agent)
+            else:
+                agents.append(calculate_agent_budget(agent, index, tokens, token_limit))
+
+    return {
+        'context_window': context_window,
+        'token_limit': token_limit,
+        'tokenizer': tokenizer.description,
+        'modules': module_results,
+        'total_tokens': total_tokens,
+        'cache': {'path': str(cache.path), 'hits': cache.hits, 'misses': cache.misses} if cache else None,
+        'agents': agents
+    }
+
+
+def build_report(library_dir: Path, agents_dir: Path | None, context_window: int,
+                 tokenizer, cache: TokenCache | None = None) -> dict:
+    """Count module tokens and compute agent budgets."""
     # Analyze modules (not addenda)
-    module_files = find_modules(library_dir)
-    modules = {}
+    module_files = sorted(find_modules(library_dir))
+    with phase('modules', paths=module_files):
+        module_results = [analyze_module(mf, tokenizer, cache) for mf in module_files]
+
+    agent_results = None
+    if agents_dir and agents_dir.exists():
+        agent_files = sorted(agents_dir.glob('*.md'))
+        with phase('agents', paths=agent_files):
+            agent_results = [analyze_agent(af) for af in agent_files]
+
+    if cache:
+        cache.save()
+        record_cache('tokens', cache.hits, cache.misses)
+
+    with phase('budgets'):
+        return summarize_budgets(module_results, agent_results, context_window, tokenizer, cache)
+
+
+def print_text_report(report: dict, library_dir: Path):
+    """Print human-readable token report."""
+    token_limit = report['token_limit']
+    context_window = report['context_window']
 
     print("Token Count Report")
     print("==================")
-    print(f"Context window: {args.context_window:,} tokens")
+    print(f"Context window: {context_window:,} tokens")
     print(f"Per-agent module budget: {token_limit:,} tokens (10% of context window)")
+    print(f"Tokenizer: {report['tokenizer']}")
     print(f"Addenda: excluded from budget (loaded on demand)")
     print()
     print("MODULES")
@@ -142,70 +258,162 @@ def main():
     print(f"{'Module ID':<20} {'Tier':<15} {'Tokens':>10}")
     print("-" * 60)
 
-    total_tokens = 0
-    for mf in sorted(module_files):
-        result = analyze_module(mf)
+    for result in report['modules']:
         if result.get('error'):
             print(f"{result['name']:<20} ERROR: {result['error']}")
         else:
-            modules[result['module_id']] = result
             print(f"{result['module_id']:<20} {result['tier']:<15} {result['tokens']:>10}")
-            total_tokens += result['tokens']
 
     print("-" * 60)
-    print(f"{'TOTAL':<35} {total_tokens:>10}")
+    print(f"{'TOTAL':<35} {report['total_tokens']:>10}")
     print()
 
-    # Analyze agents if provided
-    if agents_dir and agents_dir.exists():
-        agent_files = list(agents_dir.glob('*.md'))
-
-        if agent_files:
-            limit_label = f"% of {token_limit // 1000}K"
-            print("AGENT TOKEN BUDGETS (modules only — addenda excluded)")
-            print("-" * 70)
-            print(f"{'Agent':<30} {'Tokens':>10} {limit_label:>10} {'Status':>10}")
-            print("-" * 70)
-
-            for af in sorted(agent_files):
-                agent = analyze_agent(af)
-                if agent.get('error'):
-                    print(f"{agent['name']:<30} ERROR: {agent['error']}")
-                    continue
-
-                # Calculate actual tokens from modules only
-                agent_tokens = 0
-                missing_modules = []
-                for mod_id in agent['modules']:
-                    # Try to match module by ID or filename
-                    matched = False
-                    for mid, mdata in modules.items():
-                        if mid == mod_id or mdata['name'] == mod_id:
-                            agent_tokens += mdata['tokens']
-                            matched = True
-                            break
-                    if not matched:
-                        missing_modules.append(mod_id)
-
-                pct = (agent_tokens / token_limit) * 100
-                status = "OK" if agent_tokens < token_limit else "OVER"
-                if pct > 80:
-                    status = "WARN" if status == "OK" else status
-
-                print(f"{agent['name']:<30} {agent_tokens:>10} {pct:>9.1f}% {status:>10}")
-
-                if missing_modules:
-                    print(f"  Missing: {', '.join(missing_modules)}")
-
-            print("-" * 70)
-            print()
-            print(f"Budget: 10% of {args.context_window:,} context window = {token_limit:,} tokens per agent")
-            print("Status: OK = under 80%, WARN = 80-100%, OVER = exceeds limit")
-            print("Note: Addenda are loaded on demand and do not count against this budget.")
-
-    else:
+    cache = report['cache']
+    if cache:
+        print(f"Token cache: {cache['hits']} hits, {cache['misses']} misses ({cache['path']})")
+        print()
+
+    agents = report['agents']
+    if agents is None:
         print("No agents directory provided. Run with agents path to check budgets:")
         print(f"  python count_tokens.py {library_dir} ./agents")
+        return
+
+    if not agents:
+        return
+
+    limit_label = f"% of {token_limit // 1000}K"
+    print("AGENT TOKEN BUDGETS (modules only — addenda excluded)")
+    print("-" * 70)
+    print(f"{'Agent':<30} {'Tokens':>10} {limit_label:>10} {'Status':>10}")
+    print("-" * 70)
+
+    for agent in agents:
+        if agent.get('error'):
+            print(f"{agent['name']:<30} ERROR: {agent['error']}")
+            continue
+
+        pct = (agent['tokens'] / token_limit) * 100
+        print(f"{agent['name']:<30} {agent['tokens']:>10} {pct:>9.1f}% {agent['status']:>10}")
+
+        if agent['missing']:
+            print(f"  Missing: {', '.join(map(str, agent['missing']))}")
+
+    print("-" * 70)
+    print()
+    print(f"Budget: 10% of {context_window:,} context window = {token_limit:,} tokens per agent")
+    print("Status: OK = under 80%, WARN = 80-100%, OVER = exceeds limit")
+    print("Note: Addenda are loaded on demand and do not count against this budget.")
+
+
+def watch_budgets(library_dir: Path, agents_dir: Path | None, context_window: int,
+                  tokenizer, cache: TokenCache | None = None, as_json: bool = False):
+    """Print the report, then refresh it whenever a module or agent file changes."""
+    has_agents = bool(agents_dir and agents_dir.exists())
+    module_results = {mf: analyze_module(mf, tokenizer, cache) for mf in find_modules(library_dir)}
+    agent_results = {af: analyze_agent(af) for af in agents_dir.glob('*.md')} if has_agents else {}
+
+    def render():
+        report = summarize_budgets(
+            [module_results[p] for p in sorted(module_results)],
+            [agent_results[p] for p in sorted(agent_results)] if has_agents else None,
+            context_window, tokenizer, cache
+        )
+        if as_json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_text_report(report, library_dir)
+        sys.stdout.flush()
+
+    def list_files():
+        files = find_modules(library_dir)
+        if has_agents:
+            files.extend(agents_dir.glob('*.md'))
+        return files
+
+    def on_change(changed, removed):
+        start = time.perf_counter()
+        for path in removed:
+            module_results.pop(path, None)
+            agent_results.pop(path, None)
+        # Only changed files are re-read and re-parsed; budgets are re-summed from cached results
+        for path in changed:
+            if has_agents and path.parent == agents_dir:
+                agent_results[path] = analyze_agent(path)
+            else:
+                module_results[path] = analyze_module(path, tokenizer, cache)
+        if cache:
+            cache.prune(module_results)
+            cache.save()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"\n--- {datetime.now():%H:%M:%S}: {len(changed) + len(removed)} file(s) changed, "
+              f"re-analyzed in {elapsed_ms:.1f} ms ---\n", file=sys.stderr)
+        render()
+
+    if cache:
+        cache.prune(module_results)
+        cache.save()
+    render()
+
+    directories = [library_dir] + [library_dir / d for d in ('foundation', 'shared', 'specialized')]
+    if has_agents:
+        directories.append(agents_dir)
+    watch_files(list_files, on_change, directories)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Count tokens in context library modules and calculate agent budgets.'
+    )
+    parser.add_argument('library_dir',
+                       help='Path to library/ folder with modules')
+    parser.add_argument('agents_dir', nargs='?',
+                       help='Optional path to agents/ folder')
+    parser.add_argument('--context-window', type=int, default=DEFAULT_CONTEXT_WINDOW,
+                       help=f'Target model context window in tokens (default: {DEFAULT_CONTEXT_WINDOW:,})')
+    parser.add_argument('--vocab', type=str,
+                       help='tiktoken-format BPE vocabulary file for exact counts (default: heuristic)')
+    parser.add_argument('--cache', type=str,
+                       help=f'BPE token cache file (default: <library_dir>/{CACHE_FILENAME})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Re-tokenize every module instead of using the BPE token cache')
+    parser.add_argument('--json', action='store_true',
+                       help='Output as JSON instead of text')
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running and refresh the report when modules or agents change')
+    add_timing_arguments(parser)
+
+    args = parser.parse_args()
+    library_dir = Path(args.library_dir)
+    agents_dir = Path(args.agents_dir) if args.agents_dir else None
+
+    if not library_dir.exists():
+        print(f"Error: Library directory '{library_dir}' not found")
+        sys.exit(1)
+
+    try:
+        tokenizer = load_tokenizer(args.vocab)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load vocabulary '{args.vocab}': {e}")
+        sys.exit(1)
+
+    cache = None
+    if args.vocab and not args.no_cache:
+        cache = TokenCache(Path(args.cache) if args.cache else library_dir / CACHE_FILENAME)
+
+    if args.watch:
+        watch_budgets(library_dir, agents_dir, args.context_window, tokenizer, cache, args.json)
+        return
+
+    start_timings('count_tokens', args)
+    report = build_report(library_dir, agents_dir, args.context_window, tokenizer, cache)
+
+    with phase('report'):
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_text_report(report, library_dir)
+    finish_timings()
 
 
 if __name__ == '__main__':
@@ -12,77 +12,132 @@ The script:
 4. The LLM must read and process every file in this index
 
 Usage:
-    python create_source_index.py <SOURCE_PATH> <OUTPUT_PATH>
+    python create_source_index.py <SOURCE_PATH> <OUTPUT_PATH> [--incremental] [--jobs N]
 
 Example:
     python create_source_index.py ./source ./context-library
+    python create_source_index.py ./source ./context-library --incremental --jobs 8
+
+With --incremental, an existing source-index.md is updated in place: only
+new or changed files are re-read, and checklist marks, notes, hand-edited
+Type/Status values, and the Conflicts/Gaps sections are kept. Incremental
+runs keep what was generated for each file in .source-index-state.json next
+to the index; a plain run writes only source-index.md.
 """
 
 import os
 import sys
 import re
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from datetime import datetime
 
+from source_files import find_documents
+from timings import add_timing_arguments, finish_timings, phase, record_cache, start_timings
+from tokenizer import count_stream_words, tokens_from_words
+
+
+INDEX_FILENAME = 'source-index.md'
+STATE_FILENAME = '.source-index-state.json'
+DEFAULT_NOTES = '*notes: [add after reading]*'
+CHECKLIST_PATTERN = re.compile(r'^- \[([ xX])\] \d+\. `(.+)` — (.*)$')
+STATUS_PATTERN = re.compile(r'^\*\*Status:\*\* (.+)$', re.MULTILINE)
+
+CLASSIFY_WINDOW = 2000  # characters of content checked for indicators
+DESCRIPTION_LINES = 20  # lines of content checked for a description
+HEAD_SIZE = 1 << 16  # characters read up front (at least CLASSIFY_WINDOW)
+
+# Indicator groups in priority order: the first group found decides the type
+TRANSCRIPT_INDICATORS = [
+    'transcript', 'recording', 'meeting notes',
+    '[speaker', 'speaker:', 'q:', 'a:',
+    'um,', 'uh,', 'you know,', 'i mean,',
+    '>> ', '>>> ',
+]
+INTERVIEW_INDICATORS = ['interview', 'q&a', 'conversation with', 'discussion with']
+STRATEGY_INDICATORS = [
+    'strategy', 'strategic', 'vision', 'mission', 'positioning',
+    'roadmap', 'plan', 'goals', 'objectives', 'reorganization'
+]
+OPERATIONAL_INDICATORS = [
+    'process', 'procedure', 'workflow', 'handbook', 'guide',
+    'policy', 'standard', 'protocol', 'sop'
+]
+NOTES_INDICATORS = ['notes', 'memo', 'minutes']
+CONVERSATIONAL_INDICATORS = ['said', 'mentioned']
+
+
+def compile_indicators(groups: dict) -> re.Pattern:
+    """
+    Compile indicator groups into one pattern that reports, at every
+    position, the first group with an indicator starting there.
+
+    The lookahead lets matches overlap, so an indicator is never hidden by
+    one that started earlier. Two groups can only compete at the same
+    position when one indicator is a prefix of another; groups are listed
+    in priority order, so the winner is the one that decides the type.
+    """
+    alternatives = '|'.join(
+        f"(?P<{name}>{'|'.join(re.escape(ind) for ind in indicators)})"
+        for name, indicators in groups.items()
+    )
+    return re.compile(f'(?=(?:{alternatives}))')
+
 
-def count_words(text: str) -> int:
-    """Count words in text."""
-    return len(text.split())
+NAME_PATTERN = compile_indicators({
+    'transcript': TRANSCRIPT_INDICATORS,
+    'interview': INTERVIEW_INDICATORS,
+    'strategy': STRATEGY_INDICATORS,
+    'operational': OPERATIONAL_INDICATORS,
+    'notes': NOTES_INDICATORS,
+})
+CONTENT_PATTERN = compile_indicators({
+    'transcript': TRANSCRIPT_INDICATORS,
+    'interview': INTERVIEW_INDICATORS,
+    'conversational': CONVERSATIONAL_INDICATORS,
+})
 
 
-def estimate_tokens(text: str) -> int:
-    """Estimate tokens (roughly 0.75 words per token for English)."""
-    words = count_words(text)
-    return int(words / 0.75)
+def find_indicators(pattern: re.Pattern, text: str) -> set:
+    """Names of the indicator groups found in text."""
+    return {match.lastgroup for match in pattern.finditer(text)}
 
 
-def classify_document(filepath: Path, content: str) -> tuple[str, str]:
+def classify_document(filepath: Path, content: str, window: int = CLASSIFY_WINDOW) -> tuple[str, str]:
     """
     Classify document type and initial status.
 
+    Only the first `window` characters of content are lowercased and
+    scanned, in one pass; the file name is scanned in another.
+
     Returns: (type, status)
     - type: strategy, operational, transcript, interview, notes, reference
     - status: ready, needs-synthesis
     """
-    name_lower = filepath.name.lower()
-    content_lower = content.lower()[:2000]  # Check first 2000 chars
-
-    # Check for transcript indicators
-    transcript_indicators = [
-        'transcript', 'recording', 'meeting notes',
-        '[speaker', 'speaker:', 'q:', 'a:',
-        'um,', 'uh,', 'you know,', 'i mean,',
-        '>> ', '>>> ',
-    ]
-    if any(ind in name_lower or ind in content_lower for ind in transcript_indicators):
+    # Lowercasing never shortens text, so this equals content.lower()[:window]
+    content_lower = content[:window].lower()[:window]
+    found_in_name = find_indicators(NAME_PATTERN, filepath.name.lower())
+    found_in_content = find_indicators(CONTENT_PATTERN, content_lower)
+
+    if 'transcript' in found_in_name or 'transcript' in found_in_content:
         return ('transcript', 'needs-synthesis')
 
-    # Check for interview indicators
-    interview_indicators = ['interview', 'q&a', 'conversation with', 'discussion with']
-    if any(ind in name_lower or ind in content_lower for ind in interview_indicators):
+    if 'interview' in found_in_name or 'interview' in found_in_content:
         return ('interview', 'needs-synthesis')
 
-    # Check for strategy documents
-    strategy_indicators = [
-        'strategy', 'strategic', 'vision', 'mission', 'positioning',
-        'roadmap', 'plan', 'goals', 'objectives', 'reorganization'
-    ]
-    if any(ind in name_lower for ind in strategy_indicators):
+    # Strategy, operational and notes are recognized by file name only
+    if 'strategy' in found_in_name:
         return ('strategy', 'ready')
 
-    # Check for operational documents
-    operational_indicators = [
-        'process', 'procedure', 'workflow', 'handbook', 'guide',
-        'policy', 'standard', 'protocol', 'sop'
-    ]
-    if any(ind in name_lower for ind in operational_indicators):
+    if 'operational' in found_in_name:
         return ('operational', 'ready')
 
-    # Check for notes (may need synthesis)
-    notes_indicators = ['notes', 'memo', 'minutes']
-    if any(ind in name_lower for ind in notes_indicators):
+    if 'notes' in found_in_name:
         # Check if it looks conversational
-        if 'said' in content_lower or 'mentioned' in content_lower:
+        if 'conversational' in found_in_content:
             return ('notes', 'needs-synthesis')
         return ('notes', 'ready')
 
@@ -93,7 +148,7 @@ def classify_document(filepath: Path, content: str) -> tuple[str, str]:
 def extract_brief_description(content: str) -> str:
     """Extract a brief description from the document."""
     # Try to get first heading
-    for line in content.split('\n')[:20]:
+    for line in content.split('\n')[:DESCRIPTION_LINES]:
         if line.startswith('# '):
             return line[2:].strip()[:60]
 
@@ -106,63 +161,204 @@ def extract_brief_description(content: str) -> str:
     return ""
 
 
-def find_documents(source_dir: Path) -> list[Path]:
-    """Find all markdown and text documents."""
-    extensions = {'.md', '.txt', '.markdown'}
-    documents = []
-
-    for ext in extensions:
-        documents.extend(source_dir.rglob(f'*{ext}'))
-
-    # Filter out hidden files
-    documents = [d for d in documents if not any(
-        part.startswith('.') for part in d.parts
-    )]
+def index_document(doc: Path, source_dir: Path) -> dict:
+    """
+    Classify one document and estimate its tokens.
 
-    return sorted(documents)
+    Only the head of the file (enough for classification and the
+    description) is held in memory; the rest is streamed for the word count.
+    """
+    try:
+        with open(doc, 'r', encoding='utf-8') as f:
+            head = f.read(HEAD_SIZE)
+            while head.count('\n') < DESCRIPTION_LINES:
+                more = f.read(HEAD_SIZE)
+                if not more:
+                    break
+                head += more
+            tokens = tokens_from_words(count_stream_words(f, head))
+
+        doc_type, status = classify_document(doc, head)
+        return {
+            'path': str(doc.relative_to(source_dir)),
+            'type': doc_type,
+            'status': status,
+            'tokens': tokens,
+            'description': extract_brief_description(head)
+        }
+    except Exception as e:
+        return {
+            'path': str(doc.relative_to(source_dir)),
+            'type': 'error',
+            'status': 'error',
+            'tokens': 0,
+            'description': f'Error: {e}'
+        }
+
+
+def index_documents(documents: list, source_dir: Path, jobs: int = 1) -> list:
+    """
+    Index documents, on a process pool when jobs > 1.
+    Results are returned in documents order either way.
+    """
+    if jobs > 1 and len(documents) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunksize = max(1, len(documents) // (jobs * 4))
+            return list(executor.map(index_document, documents, repeat(source_dir), chunksize=chunksize))
+    return [index_document(doc, source_dir) for doc in documents]
 
 
-def generate_source_index(source_dir: Path, output_dir: Path) -> str:
-    """Generate the source-index.md content."""
-    documents = find_documents(source_dir)
+def parse_source_index(text: str) -> dict:
+    """
+    Read back the parts of an existing source-index.md that are edited by
+    hand: table rows, checklist marks and notes, the Status field, and the
+    Conflicts/Gaps sections.
+    """
+    rows = {}
+    checklist = {}
+    in_table = False
+    for line in text.split('\n'):
+        if line.startswith('## '):
+            in_table = line.strip() == '## Source Files'
+            continue
+        if in_table and line.startswith('|'):
+            cells = line.strip()[1:-1].split('|', 5)
+            if len(cells) == 6 and cells[0].strip().isdigit():
+                tokens = cells[4].strip().lstrip('~').replace(',', '')
+                rows[cells[1].strip()] = {
+                    'path': cells[1].strip(),
+                    'type': cells[2].strip(),
+                    'status': cells[3].strip(),
+                    'tokens': int(tokens) if tokens.isdigit() else 0,
+                    'description': cells[5].strip()
+                }
+            continue
+        match = CHECKLIST_PATTERN.match(line)
+        if match:
+            checklist[match.group(2)] = (match.group(1), match.group(3))
+
+    status = STATUS_PATTERN.search(text)
+    start = text.find('\n## Conflicts Identified')
+    end = text.find('\n## Next Steps')
+    return {
+        'rows': rows,
+        'checklist': checklist,
+        'status': status.group(1).strip() if status else None,
+        'findings': text[start + 1:end + 1] if start != -1 and end > start else None
+    }
+
+
+def load_index_state(state_path: Path) -> dict:
+    """Generated entries and (size, mtime_ns) keys from the last run, by path."""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('files', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_index_state(state_path: Path, files: dict):
+    with open(state_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': 1, 'files': files}, f)
+
+
+def generate_source_index(source_dir: Path, output_dir: Path, jobs: int = 1,
+                          incremental: bool = False) -> str:
+    """
+    Generate the source-index.md content.
+
+    With incremental, an existing index in output_dir is merged instead of
+    replaced: only new or changed files are re-read, checklist marks,
+    notes, the Status field and the Conflicts/Gaps sections are kept, and
+    Type/Status values edited by hand survive. What was generated for each
+    file is recorded in output_dir/.source-index-state.json so hand edits
+    can be told apart from generated values; the state file is only written
+    with incremental.
+    """
+    with phase('discover') as record:
+        documents = find_documents(source_dir)
+        record['files'] = len(documents)
 
     if not documents:
         return f"# Source Index\n\nNo documents found in {source_dir}\n"
 
-    # Analyze each document
-    file_entries = []
-    total_tokens = 0
-    needs_synthesis_count = 0
+    index_path = output_dir / INDEX_FILENAME
+    state_path = output_dir / STATE_FILENAME
+    previous = None
+    if incremental and index_path.exists():
+        previous = parse_source_index(index_path.read_text(encoding='utf-8'))
+    recorded = load_index_state(state_path) if previous else {}
 
+    # Re-read only files that are new, changed, or missing from the index
+    keys = {}
+    pending = []
     for doc in documents:
+        rel_path = str(doc.relative_to(source_dir))
         try:
-            with open(doc, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            rel_path = doc.relative_to(source_dir)
-            doc_type, status = classify_document(doc, content)
-            tokens = estimate_tokens(content)
-            description = extract_brief_description(content)
-
-            total_tokens += tokens
-            if status == 'needs-synthesis':
-                needs_synthesis_count += 1
-
-            file_entries.append({
-                'path': str(rel_path),
-                'type': doc_type,
-                'status': status,
-                'tokens': tokens,
-                'description': description
-            })
-        except Exception as e:
-            file_entries.append({
-                'path': str(doc.relative_to(source_dir)),
-                'type': 'error',
-                'status': 'error',
-                'tokens': 0,
-                'description': f'Error: {e}'
-            })
+            stat = doc.stat()
+            keys[rel_path] = [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            keys[rel_path] = None
+        saved = recorded.get(rel_path)
+        if not (previous and rel_path in previous['rows'] and saved
+                and keys[rel_path] and saved['key'] == keys[rel_path]):
+            pending.append(doc)
+
+    with phase('index') as record:
+        fresh = {entry['path']: entry for entry in index_documents(pending, source_dir, jobs)}
+        record['files'] = len(pending)
+        record['bytes'] = sum(keys[path][0] for path in fresh if keys[path])
+
+    file_entries = []
+    state = {}
+    for doc in documents:
+        rel_path = str(doc.relative_to(source_dir))
+        row = previous['rows'].get(rel_path) if previous else None
+        saved = recorded.get(rel_path)
+
+        if rel_path in fresh:
+            generated = fresh[rel_path]
+            entry = dict(generated)
+            if row and generated['type'] != 'error':
+                # A value that differs from what was last generated was edited by hand
+                for field in ('type', 'status'):
+                    if saved is None or row[field] != saved['entry'][field]:
+                        entry[field] = row[field]
+        else:
+            generated = saved['entry']
+            entry = dict(row)
+
+        if generated['type'] != 'error' and keys[rel_path]:
+            state[rel_path] = {'key': keys[rel_path], 'entry': generated}
+
+        checked, notes = (' ', DEFAULT_NOTES)
+        if previous and rel_path in previous['checklist']:
+            checked, notes = previous['checklist'][rel_path]
+        entry['checked'] = checked
+        entry['notes'] = notes
+        file_entries.append(entry)
+
+    if incremental:
+        save_index_state(state_path, state)
+
+    if previous:
+        removed = len(set(previous['rows']) - set(keys))
+        record_cache('index_state', len(documents) - len(pending), len(pending))
+        print(f"Re-indexed {len(pending)} of {len(documents)} files "
+              f"({len(documents) - len(pending)} unchanged, {removed} removed)")
+
+    with phase('render'):
+        if previous:
+            return render_source_index(source_dir, output_dir, file_entries,
+                                       previous['status'] or 'indexing', previous['findings'])
+        return render_source_index(source_dir, output_dir, file_entries)
+
+
+def render_source_index(source_dir: Path, output_dir: Path, file_entries: list,
+                        status: str = 'indexing', findings: str | None = None) -> str:
+    """Render source-index.md from file entries."""
+    total_tokens = sum(entry['tokens'] for entry in file_entries)
+    needs_synthesis_count = sum(1 for entry in file_entries if entry['status'] == 'needs-synthesis')
 
     # Generate markdown
     lines = [
@@ -171,7 +367,7 @@ def generate_source_index(source_dir: Path, output_dir: Path) -> str:
         f"**Generated:** {datetime.now().strftime('%Y-%m-%d')}",
         f"**Source path:** {source_dir}",
         f"**Output path:** {output_dir}",
-        "**Status:** indexing",
+        f"**Status:** {status}",
         "",
         f"**Total files:** {len(file_entries)}",
         f"**Total tokens:** ~{total_tokens:,}",
@@ -257,32 +453,41 @@ def generate_source_index(source_dir: Path, output_dir: Path) -> str:
     ])
 
     for i, entry in enumerate(file_entries, 1):
-        lines.append(f"- [ ] {i}. `{entry['path']}` — *notes: [add after reading]*")
+        lines.append(f"- [{entry['checked']}] {i}. `{entry['path']}` — {entry['notes']}")
 
     lines.extend([
         "",
         "---",
         "",
-        "## Conflicts Identified",
-        "",
-        "**Add conflicts here as you discover them:**",
-        "",
-        "*Example: Document A says X, but Document B says Y — need to resolve*",
-        "",
-        "- *(none yet)*",
-        "",
-        "---",
-        "",
-        "## Gaps Identified",
-        "",
-        "**Add missing information here as you discover it:**",
-        "",
-        "*Example: No information found about pricing structure*",
-        "",
-        "- *(none yet)*",
-        "",
-        "---",
-        "",
+    ])
+
+    if findings is not None:
+        lines.extend(findings.split('\n')[:-1])
+    else:
+        lines.extend([
+            "## Conflicts Identified",
+            "",
+            "**Add conflicts here as you discover them:**",
+            "",
+            "*Example: Document A says X, but Document B says Y — need to resolve*",
+            "",
+            "- *(none yet)*",
+            "",
+            "---",
+            "",
+            "## Gaps Identified",
+            "",
+            "**Add missing information here as you discover it:**",
+            "",
+            "*Example: No information found about pricing structure*",
+            "",
+            "- *(none yet)*",
+            "",
+            "---",
+            "",
+        ])
+
+    lines.extend([
         "## Next Steps",
         "",
         "When ALL files above are marked [x]:",
@@ -298,13 +503,21 @@ def generate_source_index(source_dir: Path, output_dir: Path) -> str:
 
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: python create_source_index.py <SOURCE_PATH> <OUTPUT_PATH>")
-        print("Example: python create_source_index.py ./source ./context-library")
-        sys.exit(1)
-
-    source_dir = Path(sys.argv[1])
-    output_dir = Path(sys.argv[2])
+    parser = argparse.ArgumentParser(
+        description='Create the source index for context library building'
+    )
+    parser.add_argument('source_dir', help='Directory containing source documents')
+    parser.add_argument('output_dir', help='Directory to write source-index.md to')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Merge into an existing source-index.md, re-reading only new or '
+                            'changed files and keeping checklist notes and hand-edited status')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Index files on N worker processes (default: 1)')
+    add_timing_arguments(parser)
+    args = parser.parse_args()
+
+    source_dir = Path(args.source_dir)
+    output_dir = Path(args.output_dir)
 
     if not source_dir.exists():
         print(f"Error: Source directory '{source_dir}' not found")
@@ -314,11 +527,14 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Generate and write index
-    index_content = generate_source_index(source_dir, output_dir)
-    index_path = output_dir / 'source-index.md'
-
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(index_content)
+    start_timings('create_source_index', args)
+    index_content = generate_source_index(source_dir, output_dir, args.jobs, args.incremental)
+    index_path = output_dir / INDEX_FILENAME
+
+    with phase('write', files=1, bytes=len(index_content.encode('utf-8'))):
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write(index_content)
+    finish_timings()
 
     print(f"Source index created: {index_path}")
     print(f"")
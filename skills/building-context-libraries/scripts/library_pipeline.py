@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Run every context library check in one pass over a shared in-memory model.
+
+The library and agent definitions are read and their frontmatter parsed
+once, and the source tree is walked once. Source analysis, token budgets,
+validation and fact verification then run as stages over that model
+(optionally side by side) and are combined into a single report.
+
+Usage:
+    python library_pipeline.py <library_dir> [source_dir] [--agents DIR] [--stages LIST]
+                               [--parallel] [--jobs N] [--index FILE] [--json] [--output FILE]
+
+Examples:
+    python library_pipeline.py ./context-library/modules ./sources --agents ./context-library/agents
+    python library_pipeline.py ./context-library/modules ./sources --parallel --jobs 8 --json
+    python library_pipeline.py ./context-library/modules --stages budgets,validation
+
+Exits 1 if validation finds issues, facts cannot be verified, or an agent
+is over its module budget.
+"""
+
+import sys
+import json
+import argparse
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+from analyze_sources import (
+    CACHE_FILENAME as ANALYSIS_CACHE_FILENAME, AnalysisCache, analyze_cached, analyze_files, summarize
+)
+from corpus_stats import CorpusColumns, print_stats
+from count_tokens import (
+    CACHE_FILENAME as TOKEN_CACHE_FILENAME, DEFAULT_CONTEXT_WINDOW, agent_result, module_result,
+    parse_frontmatter, print_text_report, summarize_budgets
+)
+from near_duplicates import DEFAULT_THRESHOLD
+from source_files import find_documents
+from timings import add_timing_arguments, start_timings, finish_timings, phase, record_cache
+from tokenizer import TokenCache, load_tokenizer
+from validate_library import (
+    build_duplicate_index, check_library, find_modules, module_analysis, print_results
+)
+from verify_module import (
+    find_facts, print_library_report, resolve_facts, search_order, verification_report
+)
+
+
+STAGES = ('analysis', 'budgets', 'validation', 'verification')
+SOURCE_STAGES = ('analysis', 'verification')  # need a source directory
+TIERS = ('foundation', 'shared', 'specialized')
+
+
+def load_file(filepath: Path) -> dict:
+    """Read a markdown file and parse its frontmatter."""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+        frontmatter, body = parse_frontmatter(content)
+        return {'path': filepath, 'content': content, 'frontmatter': frontmatter, 'body': body,
+                'error': None}
+    except Exception as e:
+        return {'path': filepath, 'error': str(e)}
+
+
+class LibraryModel:
+    """Library modules, agent definitions and source documents, loaded once for every stage."""
+
+    def __init__(self, library_dir: Path, agents_dir: Path | None = None,
+                 source_dir: Path | None = None):
+        self.library_dir = library_dir
+        self.agents_dir = agents_dir
+        self.source_dir = source_dir
+
+        # Every module validation looks at: the tier folders plus the library root
+        module_files = sorted(find_modules(library_dir))
+        agent_files = sorted(agents_dir.glob('*.md')) if agents_dir and agents_dir.exists() else None
+        with phase('load', paths=module_files + (agent_files or [])):
+            self.modules = [load_file(mf) for mf in module_files]
+            self.agents = [load_file(af) for af in agent_files] if agent_files is not None else None
+
+        self.sources = []
+        if source_dir:
+            with phase('discover') as record:
+                self.sources = find_documents(source_dir)
+                record['files'] = len(self.sources)
+
+    def tier_modules(self) -> list:
+        """Modules in foundation/, shared/ and specialized/, as budgets and verification count them."""
+        return [m for m in self.modules
+                if m['path'].parent.name in TIERS and m['path'].parent.parent == self.library_dir]
+
+
+def run_analysis(model: LibraryModel, cache_path: Path | None, jobs: int = 1,
+                 start_method: str | None = None) -> dict:
+    """Source inventory totals and corpus statistics."""
+    cache = None
+    if cache_path:
+        try:
+            cache = AnalysisCache(cache_path)
+        except sqlite3.Error as e:
+            print(f"Warning: analysis cache unavailable ({e}); analyzing all documents",
+                  file=sys.stderr)
+
+    if cache:
+        results = analyze_cached(model.sources, model.source_dir, cache, jobs, start_method,
+                                 summary_only=True)
+    else:
+        results = analyze_files(model.sources, model.source_dir, jobs, start_method)
+
+    columns = CorpusColumns()
+    total_words = 0
+    total_tokens = 0
+    for result in results:
+        columns.add(result)
+        if not result.get('error'):
+            total_words += result['words']
+            total_tokens += result['tokens_est']
+    if cache:
+        record_cache('analysis', cache.hits, cache.misses)
+
+    return {
+        'summary': summarize(len(model.sources), total_words, total_tokens),
+        'stats': columns.compute(),
+    }
+
+
+def run_budgets(model: LibraryModel, context_window: int, tokenizer,
+                cache: TokenCache | None = None) -> dict:
+    """Module token counts and per-agent budgets, as count_tokens.py reports them."""
+    module_results = [
+        module_result(m['path'], m['content'], m['frontmatter'], tokenizer, cache) if not m['error']
+        else {'path': str(m['path']), 'name': m['path'].stem, 'error': m['error']}
+        for m in model.tier_modules()
+    ]
+
+    agent_results = None
+    if model.agents is not None:
+        agent_results = [
+            agent_result(a['path'], a['frontmatter']) if not a['error']
+            else {'path': str(a['path']), 'name': a['path'].stem, 'error': a['error']}
+            for a in model.agents
+        ]
+
+    if cache:
+        cache.save()
+        record_cache('tokens', cache.hits, cache.misses)
+
+    return summarize_budgets(module_results, agent_results, context_window, tokenizer, cache)
+
+
+def run_validation(model: LibraryModel, similarity: float = DEFAULT_THRESHOLD,
+                   fail_on_duplicates: bool = False) -> dict:
+    """Structure, cross-reference and duplication checks, as validate_library.py runs them."""
+    modules = [
+        module_analysis(m['path'], m['content'], m['frontmatter'], m['body']) if not m['error']
+        else {'path': str(m['path']), 'filename': m['path'].name, 'error': m['error']}
+        for m in model.modules
+    ]
+    lines, issues = check_library(modules, build_duplicate_index(modules), similarity,
+                                  fail_on_duplicates)
+    return {'modules': len(modules), 'lines': lines, 'issues': issues}
+
+
+def run_verification(model: LibraryModel, index_path: Path | None) -> dict:
+    """Module facts checked against the sources, as verify_module.py --library reports them."""
+    modules = model.tier_modules()
+    module_facts = [find_facts(m['content']) if not m['error'] else [] for m in modules]
+    all_facts = [fact for facts in module_facts for fact, _ in facts]
+    sources = resolve_facts(all_facts, model.source_dir, index_path, log_file=sys.stderr,
+                            source_files=search_order(model.sources))
+    return verification_report(model.library_dir, model.source_dir, [m['path'] for m in modules],
+                               module_facts, sources)
+
+
+def run_stages(runners: dict, parallel: bool = False) -> dict:
+    """
+    Run each stage (name -> callable) and return name -> result.
+    With parallel, stages run on threads over the same model.
+    """
+    def run(name):
+        with phase(name):
+            return runners[name]()
+
+    if parallel and len(runners) > 1:
+        with ThreadPoolExecutor(max_workers=len(runners)) as executor:
+            return dict(zip(runners, executor.map(run, runners)))
+    return {name: run(name) for name in runners}
+
+
+def count_problems(report: dict) -> dict:
+    """Problem counts per stage that was run (0 means the stage passed)."""
+    problems = {}
+    if 'budgets' in report:
+        problems['budgets'] = sum(1 for a in report['budgets']['agents'] or []
+                                  if a.get('status') == 'OVER')
+    if 'validation' in report:
+        problems['validation'] = len(report['validation']['issues'])
+    if 'verification' in report:
+        problems['verification'] = len(report['verification']['unverified'])
+    return problems
+
+
+def print_pipeline_report(report: dict, library_dir: Path):
+    """Print each stage's report, then the combined summary."""
+    print("Context Library Pipeline Report")
+    print("===============================")
+    print(f"Library directory: {report['library_directory']}")
+    if report['source_directory']:
+        print(f"Source directory: {report['source_directory']}")
+    print(f"Stages: {', '.join(report['stages'])}")
+
+    if 'analysis' in report:
+        print()
+        print_stats(report['analysis']['stats'])
+    if 'budgets' in report:
+        print()
+        print_text_report(report['budgets'], library_dir)
+    if 'validation' in report:
+        validation = report['validation']
+        print()
+        print_results(library_dir, validation['modules'], validation['lines'], validation['issues'])
+    if 'verification' in report:
+        print()
+        print_library_report(report['verification'])
+
+    print()
+    print("=" * 50)
+    print("PIPELINE SUMMARY")
+    print("=" * 50)
+    if 'analysis' in report:
+        summary = report['analysis']['summary']
+        print(f"analysis: {summary['total_documents']:,} documents, "
+              f"{summary['total_tokens_est']:,} tokens (est)")
+    problems = report['problems']
+    if 'budgets' in problems:
+        agents = report['budgets']['agents']
+        print(f"budgets: {problems['budgets']} of {len(agents)} agents over budget" if agents is not None
+              else f"budgets: {report['budgets']['total_tokens']:,} module tokens (no agents)")
+    if 'validation' in problems:
+        print(f"validation: {problems['validation']} issues")
+    if 'verification' in problems:
+        print(f"verification: {problems['verification']} of "
+              f"{report['verification']['summary']['facts']} facts unverified")
+    print()
+    print(f"Status: {report['status']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run analysis, token budgets, validation and fact verification in one pass.'
+    )
+    parser.add_argument('library_dir',
+                       help='Path to library/ folder with modules')
+    parser.add_argument('source_dir', nargs='?',
+                       help='Directory containing source documents (for analysis and verification)')
+    parser.add_argument('--agents', type=str,
+                       help='Path to agents/ folder (for per-agent budgets)')
+    parser.add_argument('--stages', type=str,
+                       help=f'Comma-separated stages to run (default: all of {",".join(STAGES)} '
+                            'that apply)')
+    parser.add_argument('--parallel', action='store_true',
+                       help='Run the stages concurrently over the shared model')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Analyze source documents on N worker processes (default: 1)')
+    parser.add_argument('--context-window', type=int, default=DEFAULT_CONTEXT_WINDOW,
+                       help=f'Target model context window in tokens (default: {DEFAULT_CONTEXT_WINDOW:,})')
+    parser.add_argument('--vocab', type=str,
+                       help='tiktoken-format BPE vocabulary file for exact counts (default: heuristic)')
+    parser.add_argument('--similarity', type=float, default=DEFAULT_THRESHOLD,
+                       help=f'Near-duplicate threshold, estimated Jaccard 0-1 (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--fail-on-duplicates', action='store_true',
+                       help='Count near-duplicate module pairs as validation issues instead of warnings')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Skip the analysis cache and token cache')
+    parser.add_argument('--index', type=str,
+                       help='Keep a persistent fact verification index in FILE (default: scan sources directly)')
+    parser.add_argument('--json', action='store_true',
+                       help='Output the combined report as JSON')
+    parser.add_argument('--output', '-o', type=str,
+                       help='Write the report to file instead of stdout')
+    add_timing_arguments(parser)
+
+    args = parser.parse_args()
+    library_dir = Path(args.library_dir)
+    source_dir = Path(args.source_dir) if args.source_dir else None
+    agents_dir = Path(args.agents) if args.agents else None
+
+    if args.stages:
+        stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+        unknown = [s for s in stages if s not in STAGES]
+        if unknown:
+            parser.error(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+        if not source_dir and any(s in SOURCE_STAGES for s in stages):
+            parser.error('source_dir is required for the analysis and verification stages')
+        stages = [s for s in STAGES if s in stages]
+    else:
+        stages = [s for s in STAGES if source_dir or s not in SOURCE_STAGES]
+
+    if not library_dir.exists():
+        print(f"Error: Library directory '{library_dir}' not found")
+        sys.exit(1)
+    if source_dir and not source_dir.exists():
+        print(f"Error: Source directory '{source_dir}' not found")
+        sys.exit(1)
+
+    tokenizer = None
+    token_cache = None
+    if 'budgets' in stages:
+        try:
+            tokenizer = load_tokenizer(args.vocab)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not load vocabulary '{args.vocab}': {e}")
+            sys.exit(1)
+        if args.vocab and not args.no_cache:
+            token_cache = TokenCache(library_dir / TOKEN_CACHE_FILENAME)
+
+    uses_sources = any(s in SOURCE_STAGES for s in stages)
+    analysis_cache = None
+    source_index = Path(args.index) if args.index and uses_sources else None
+    if uses_sources and not args.no_cache:
+        analysis_cache = source_dir / ANALYSIS_CACHE_FILENAME
+
+    start_timings('library_pipeline', args)
+    model = LibraryModel(library_dir, agents_dir, source_dir if uses_sources else None)
+
+    # Forking while the other stages' threads hold locks (YAML, sqlite) can
+    # deadlock the workers, so the analysis pool starts fresh interpreters
+    start_method = 'spawn' if args.parallel else None
+    runners = {
+        'analysis': partial(run_analysis, model, analysis_cache, args.jobs, start_method),
+        'budgets': partial(run_budgets, model, args.context_window, tokenizer, token_cache),
+        'validation': partial(run_validation, model, args.similarity, args.fail_on_duplicates),
+        'verification': partial(run_verification, model, source_index),
+    }
+    results = run_stages({name: runners[name] for name in stages}, args.parallel)
+
+    report = {
+        'pipeline_date': datetime.now().isoformat(),
+        'library_directory': str(library_dir),
+        'agents_directory': str(agents_dir) if agents_dir else None,
+        'source_directory': str(source_dir) if source_dir else None,
+        'stages': stages,
+        **results,
+    }
+    report['problems'] = count_problems(report)
+    report['status'] = 'NEEDS FIXES' if any(report['problems'].values()) else 'PASS'
+
+    with phase('report'):
+        if args.json:
+            output_str = json.dumps(report, indent=2)
+        else:
+            import io
+            old_stdout = sys.stdout
+            sys.stdout = io.StringIO()
+            print_pipeline_report(report, library_dir)
+            output_str = sys.stdout.getvalue()
+            sys.stdout = old_stdout
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output_str)
+            print(f"Output written to {args.output}", file=sys.stderr)
+        else:
+            print(output_str)
+
+    finish_timings()
+    sys.exit(1 if report['status'] != 'PASS' else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Memory-mapped source files for substring search.
+
+A file is mapped read-only and searched as UTF-8 bytes with mmap.find, so
+large transcripts are never copied into Python strings. Pages are loaded
+on demand and shared with the OS page cache, which keeps peak RSS close to
+the size of the search terms rather than the size of the corpus.
+
+Sources are UTF-8. is_utf8() checks a file a chunk at a time, so callers can
+skip undecodable files exactly as a text-mode read with encoding='utf-8'
+would fail on them.
+
+Usage (from another script):
+    from mapped_file import MappedFile
+    with MappedFile(path) as source:
+        if source.is_utf8() and source.contains('Acme Foundation'):
+            ...
+"""
+
+import codecs
+import mmap
+
+
+LINE_ENDINGS = ('\r\n', '\r')
+DECODE_CHUNK_SIZE = 1 << 20  # bytes decoded at a time by is_utf8()
+
+
+class MappedFile:
+    """Read-only memory map of a file. Empty files map to b''."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files cannot be mapped
+            self.data = b''
+        except Exception:
+            self._file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def __len__(self):
+        return len(self.data)
+
+    def is_utf8(self) -> bool:
+        """True if the whole file decodes as UTF-8."""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            for start in range(0, len(self.data), DECODE_CHUNK_SIZE):
+                decoder.decode(self.data[start:start + DECODE_CHUNK_SIZE])
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return False
+        return True
+
+    def find(self, text: str, start: int = 0) -> int:
+        """Byte offset of the first occurrence of text at or after start, or -1."""
+        return self.data.find(text.encode('utf-8'), start)
+
+    def contains(self, text: str) -> bool:
+        """
+        True if text occurs in the file. A newline in text also matches CRLF
+        and CR line endings, as it would in a file read in text mode.
+        """
+        if self.find(text) != -1:
+            return True
+        if '\n' in text:
+            return any(self.find(text.replace('\n', ending)) != -1 for ending in LINE_ENDINGS)
+        return False
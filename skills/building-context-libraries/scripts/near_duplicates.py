@@ -0,0 +1,111 @@
+"""
+Near-duplicate detection for context library modules.
+
+Each module is reduced to a fixed-size MinHash signature over word shingles
+(one-permutation hashing: every shingle is hashed once and kept as the
+minimum of its bucket). Locality-sensitive hashing over signature bands
+proposes candidate pairs, so only modules that share a band are compared.
+Work is linear in library size and memory is bounded by signature size,
+not by the number of sentences.
+
+Usage (from another script):
+    from near_duplicates import minhash_signature, find_near_duplicates
+    signatures = {name: minhash_signature(text) for name, text in modules}
+    pairs = find_near_duplicates(signatures, threshold=0.5)
+"""
+
+import re
+import zlib
+from collections import defaultdict
+
+
+NUM_BUCKETS = 126  # signature length
+BAND_ROWS = 3  # rows per LSH band (42 bands; candidates from Jaccard ~0.3)
+SHINGLE_WORDS = 5
+DEFAULT_THRESHOLD = 0.5
+
+CODE_BLOCK_PATTERN = re.compile(r'```[\s\S]*?```')
+EMPTY = 0xFFFFFFFF
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS, strip_code: bool = True) -> set:
+    """
+    Normalized word shingles (lowercase, punctuation stripped).
+    Code blocks are removed first unless the caller already did (strip_code=False).
+    """
+    if strip_code:
+        text = CODE_BLOCK_PATTERN.sub('', text)
+    words = [w for w in (w.lower().strip('.,!?:;"\'()[]*_`#') for w in text.split()) if w]
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str, num_buckets: int = NUM_BUCKETS, strip_code: bool = True) -> tuple:
+    """
+    One-permutation MinHash signature of a text's shingles.
+
+    Empty buckets borrow the value of the next non-empty bucket (rotation
+    densification) so every position is comparable. Returns () for texts
+    with no shingles.
+    """
+    signature = [EMPTY] * num_buckets
+    for shingle in shingles(text, strip_code=strip_code):
+        h = zlib.crc32(shingle.encode('utf-8'))
+        bucket = h % num_buckets
+        value = h // num_buckets
+        if value < signature[bucket]:
+            signature[bucket] = value
+
+    original = tuple(signature)
+    if all(v == EMPTY for v in original):
+        return ()
+    for i in range(num_buckets):
+        if original[i] == EMPTY:
+            # Offset by distance so borrowed values differ from the donor bucket's own
+            step = 1
+            while original[(i + step) % num_buckets] == EMPTY:
+                step += 1
+            signature[i] = original[(i + step) % num_buckets] + step * 0x10000000
+    return tuple(signature)
+
+
+def estimate_jaccard(a: tuple, b: tuple) -> float:
+    """Estimate Jaccard similarity from two signatures."""
+    if not a or not b:
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def find_near_duplicates(signatures: dict, threshold: float = DEFAULT_THRESHOLD,
+                         rows: int = BAND_ROWS) -> list[tuple[str, str, float]]:
+    """
+    Find module pairs whose estimated Jaccard similarity is at least threshold.
+
+    signatures maps module name to signature; names are compared in the
+    order given. Returns (name_a, name_b, similarity), most similar first.
+    """
+    order = {name: i for i, name in enumerate(signatures)}
+    buckets = defaultdict(list)
+    for name, signature in signatures.items():
+        if not signature:
+            continue
+        for start in range(0, len(signature) - rows + 1, rows):
+            buckets[(start, signature[start:start + rows])].append(name)
+
+    candidates = set()
+    for names in buckets.values():
+        for i in range(len(names)):
+            for j in range(i + 1, len(names)):
+                candidates.add((names[i], names[j]))
+
+    pairs = []
+    for a, b in candidates:
+        similarity = estimate_jaccard(signatures[a], signatures[b])
+        if similarity >= threshold:
+            if order[a] > order[b]:
+                a, b = b, a
+            pairs.append((a, b, similarity))
+
+    pairs.sort(key=lambda p: (-p[2], order[p[0]], order[p[1]]))
+    return pairs
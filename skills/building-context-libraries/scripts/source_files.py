@@ -0,0 +1,52 @@
+"""
+Source document discovery shared by analyze_sources.py, create_source_index.py
+and verify_module.py.
+
+The source tree is walked once with os.scandir. Hidden files are skipped and
+hidden directories (.git, .obsidian, ...) are pruned before descending, so
+large ignored trees are never traversed. Entries are yielded lazily as
+os.DirEntry objects, whose stat() results are cached after the first call.
+
+Usage (from another script):
+    from source_files import find_documents, iter_documents
+"""
+
+import os
+from pathlib import Path
+
+
+DOCUMENT_EXTENSIONS = ('.md', '.txt', '.markdown')
+
+
+def iter_documents(source_dir: Path, extensions: tuple = DOCUMENT_EXTENSIONS):
+    """
+    Yield an os.DirEntry for every document under source_dir, in walk order.
+
+    Symlinked directories are not followed (matching Path.rglob).
+    Unreadable directories are skipped.
+    """
+    stack = [os.fspath(source_dir)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    stack.append(entry.path)
+                elif entry.name.endswith(extensions):
+                    yield entry
+
+
+def find_documents(source_dir: Path) -> list[Path]:
+    """Find all markdown and text documents, sorted."""
+    # Sorting on path components gives Path ordering without Path comparisons
+    paths = sorted((entry.path for entry in iter_documents(source_dir)), key=lambda p: p.split(os.sep))
+    return [Path(p) for p in paths]
@@ -0,0 +1,206 @@
+"""
+Timing and profiling for context library scripts (--timings, --timings-file, --profile, --trace).
+
+Scripts mark their phases with `with phase(name):` and report cache use
+with record_cache(). Nothing is recorded unless the script called start_timings()
+with one of the options set, so instrumented code costs nothing otherwise.
+
+Every script reports in the same format: one JSON object per run with
+per-phase wall time, files/sec and bytes/sec, cache hit rates, and peak
+RSS. --timings prints it to stderr, and --timings-file FILE appends it as a
+line to FILE, so runs can be collected and compared over time.
+
+Usage (from another script):
+    from timings import add_timing_arguments, start_timings, finish_timings, phase
+    add_timing_arguments(parser)
+    args = parser.parse_args()
+    start_timings('analyze_sources', args)
+    with phase('analyze') as record:
+        record['files'] = len(documents)
+    finish_timings()
+"""
+
+import os
+import sys
+import json
+import argparse
+import time
+import cProfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+FORMAT_VERSION = 1
+
+_active = None  # the running recorder, if any
+
+
+def output_file(value: str) -> str:
+    """argparse type for report files, rejecting directories before any work starts."""
+    if os.path.isdir(value):
+        raise argparse.ArgumentTypeError(f"'{value}' is a directory")
+    return value
+
+
+def add_timing_arguments(parser):
+    """Add the shared --timings, --timings-file, --profile and --trace options to an argparse parser."""
+    group = parser.add_argument_group('timing and profiling')
+    group.add_argument('--timings', action='store_true',
+                       help='Report per-phase timings as JSON to stderr')
+    group.add_argument('--timings-file', type=output_file, metavar='FILE',
+                       help='Append per-phase timings as a JSON line to FILE')
+    group.add_argument('--profile', type=output_file, metavar='FILE',
+                       help='Write cProfile statistics to FILE (view with python -m pstats)')
+    group.add_argument('--trace', type=output_file, metavar='FILE',
+                       help='Write phases as Chrome trace JSON to FILE (chrome://tracing, Perfetto)')
+
+
+def peak_rss() -> dict:
+    """Peak resident set size in bytes, for this process and its largest child."""
+    if resource is None:
+        return {'self': None, 'children': None}
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    }
+
+
+class Recorder:
+    """Phases and cache counters for one run."""
+
+    def __init__(self, script: str, timings: str | None = None, profile: str | None = None,
+                 trace: str | None = None):
+        self.script = script
+        self.timings = timings
+        self.profile = profile
+        self.trace = trace
+        self.phases = []
+        self.caches = {}
+        self.started = time.perf_counter()
+        self.profiler = None
+        if profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def report(self) -> dict:
+        total = time.perf_counter() - self.started
+        phases = []
+        for record in self.phases:
+            seconds = record['seconds']
+            phases.append({
+                'name': record['name'],
+                'seconds': round(seconds, 6),
+                'files': record['files'],
+                'bytes': record['bytes'],
+                'files_per_sec': round(record['files'] / seconds, 1) if seconds else None,
+                'bytes_per_sec': round(record['bytes'] / seconds, 1) if seconds else None,
+            })
+        caches = {
+            name: {'hits': hits, 'misses': misses,
+                   'hit_rate': round(hits / (hits + misses), 4) if hits + misses else None}
+            for name, (hits, misses) in self.caches.items()
+        }
+        return {
+            'format': FORMAT_VERSION,
+            'script': self.script,
+            'timestamp': datetime.now().isoformat(),
+            'argv': sys.argv[1:],
+            'total_seconds': round(total, 6),
+            'peak_rss_bytes': peak_rss(),
+            'phases': phases,
+            'caches': caches,
+        }
+
+    def chrome_trace(self) -> dict:
+        pid = os.getpid()
+        events = [
+            {'name': record['name'], 'ph': 'X', 'pid': pid, 'tid': record['thread'],
+             'ts': round(record['start'] * 1e6), 'dur': round(record['seconds'] * 1e6),
+             'args': {'files': record['files'], 'bytes': record['bytes']}}
+            for record in self.phases
+        ]
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': self.script}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def finish(self):
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.profile)
+        if self.trace:
+            with open(self.trace, 'w', encoding='utf-8') as f:
+                json.dump(self.chrome_trace(), f)
+        if self.timings:
+            line = json.dumps(self.report())
+            if self.timings == '-':
+                print(line, file=sys.stderr)
+            else:
+                with open(self.timings, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+
+
+def start_timings(script: str, args):
+    """Start recording if any of --timings, --timings-file, --profile or --trace was given."""
+    global _active
+    timings = getattr(args, 'timings_file', None) or ('-' if getattr(args, 'timings', False) else None)
+    profile = getattr(args, 'profile', None)
+    trace = getattr(args, 'trace', None)
+    if timings or profile or trace:
+        _active = Recorder(script, timings, profile, trace)
+    return _active
+
+
+def finish_timings():
+    """Write the requested reports and stop recording."""
+    global _active
+    if _active:
+        _active.finish()
+        _active = None
+
+
+def total_bytes(paths) -> int:
+    """Combined size of the files that still exist."""
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+@contextmanager
+def phase(name: str, files: int = 0, bytes: int = 0, paths=None):
+    """
+    Time a phase of the run. Yields a dict whose 'files' and 'bytes'
+    counts can be filled in once they are known; with paths, they are
+    taken from those files (only while recording).
+    """
+    record = {'name': name, 'files': files, 'bytes': bytes}
+    if _active is None:
+        yield record
+        return
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['start'] = start - _active.started
+        record['thread'] = threading.get_native_id()
+        record['seconds'] = time.perf_counter() - start
+        if paths is not None:
+            record['files'] = len(paths)
+            record['bytes'] = total_bytes(paths)
+        _active.phases.append(record)
+
+
+def record_cache(name: str, hits: int, misses: int):
+    """Report hits and misses for a cache used during the run."""
+    if _active:
+        _active.caches[name] = (hits, misses)
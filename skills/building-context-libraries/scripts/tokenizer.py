@@ -0,0 +1,242 @@
+"""
+Token counting for context library scripts.
+
+All scripts share one heuristic (words / 0.75). Words are counted in bounded
+chunks, never by materializing a list of every word in a document, and
+count_file_words() / estimate_tokens_for_files() stream files from disk so
+large source trees do not spike memory.
+
+Two backends share one interface (`name`, `count(text)`):
+- HeuristicTokenizer: words / 0.75, no dependencies (the default)
+- BPETokenizer: byte-pair encoding from a local tiktoken-format vocabulary
+  file (one "<base64 token> <rank>" pair per line), loaded offline
+
+TokenCache stores counts keyed by tokenizer and content hash, so unchanged
+files are not re-tokenized between runs.
+
+Usage (from another script):
+    from tokenizer import load_tokenizer, TokenCache
+    tokenizer = load_tokenizer('cl100k_base.tiktoken')
+    tokens = tokenizer.count(text)
+"""
+
+import re
+import json
+import base64
+import hashlib
+from itertools import chain
+from pathlib import Path
+
+
+# Approximates the cl100k pre-tokenizer with the stdlib `re` module
+# (no \p{L}/\p{N}): letters are [^\W\d_], numbers are \d.
+PRETOKENIZE_PATTERN = re.compile(
+    r"(?i:'s|'t|'re|'ve|'m|'ll|'d)"
+    r"|(?:[^\r\n\w]|_)?[^\W\d_]+"
+    r"|\d{1,3}"
+    r"| ?(?:[^\s\w]|_)+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+)
+
+PIECE_CACHE_LIMIT = 100000
+CHUNK_SIZE = 1 << 20  # characters per counting chunk
+CACHE_VERSION = 2  # bump when counts for the same tokenizer and text change
+
+
+def _count_chunk_words(chunks) -> int:
+    """Count whitespace-separated words across consecutive text chunks."""
+    words = 0
+    previous_ends_in_word = False
+    for chunk in chunks:
+        if not chunk:
+            continue
+        words += len(chunk.split())
+        # A word split across the chunk boundary was counted twice
+        if previous_ends_in_word and not chunk[0].isspace():
+            words -= 1
+        previous_ends_in_word = not chunk[-1].isspace()
+    return words
+
+
+def count_words(text: str) -> int:
+    """Count words in text (same result as len(text.split()))."""
+    return _count_chunk_words(
+        text[i:i + CHUNK_SIZE] for i in range(0, len(text), CHUNK_SIZE)
+    )
+
+
+def count_stream_words(f, head: str = '') -> int:
+    """
+    Count words in head followed by the rest of the open text file f,
+    reading f in bounded chunks.
+    """
+    return _count_chunk_words(chain([head], iter(lambda: f.read(CHUNK_SIZE), '')))
+
+
+def count_file_words(path: Path, encoding: str = 'utf-8') -> int:
+    """Count words in a file without reading it into memory at once."""
+    with open(path, 'r', encoding=encoding) as f:
+        return count_stream_words(f)
+
+
+def tokens_from_words(words: int) -> int:
+    """Convert a word count to estimated tokens (roughly 0.75 words per token)."""
+    return int(words / 0.75)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate tokens (roughly 0.75 words per token for English)."""
+    return tokens_from_words(count_words(text))
+
+
+def estimate_tokens_for_files(paths) -> dict:
+    """
+    Estimate tokens for many files, streaming each one from disk.
+    Returns {path: tokens}; unreadable files map to None.
+    """
+    counts = {}
+    for path in paths:
+        try:
+            counts[path] = tokens_from_words(count_file_words(path))
+        except (OSError, UnicodeDecodeError):
+            counts[path] = None
+    return counts
+
+
+class HeuristicTokenizer:
+    """Word-count heuristic (words / 0.75)."""
+
+    name = 'heuristic'
+    description = 'heuristic (words / 0.75)'
+
+    def count(self, text: str) -> int:
+        return estimate_tokens(text)
+
+
+class BPETokenizer:
+    """Byte-pair encoding tokenizer driven by a precompiled rank table."""
+
+    def __init__(self, vocab_path: Path):
+        data = Path(vocab_path).read_bytes()
+        self.ranks = {}
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            token, rank = line.split()
+            self.ranks[base64.b64decode(token)] = int(rank)
+
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        self.name = f'bpe:{digest}'
+        self.description = f'BPE ({Path(vocab_path).name}, {len(self.ranks):,} tokens)'
+        self._piece_counts = {}
+
+    def _merge(self, piece: bytes) -> list:
+        """Apply merges lowest-rank first until no adjacent pair is in the vocabulary."""
+        ranks = self.ranks
+        parts = [piece[i:i + 1] for i in range(len(piece))]
+        while len(parts) > 1:
+            min_rank = None
+            min_index = None
+            for i in range(len(parts) - 1):
+                rank = ranks.get(parts[i] + parts[i + 1])
+                if rank is not None and (min_rank is None or rank < min_rank):
+                    min_rank = rank
+                    min_index = i
+            if min_index is None:
+                break
+            parts[min_index:min_index + 2] = [parts[min_index] + parts[min_index + 1]]
+        return parts
+
+    def _encode_piece(self, piece: bytes) -> list[int]:
+        """Token ranks for one pre-tokenized piece; parts missing from the vocabulary are skipped."""
+        rank = self.ranks.get(piece)
+        if rank is not None:
+            return [rank]
+        return [self.ranks[p] for p in self._merge(piece) if p in self.ranks]
+
+    def encode(self, text: str) -> list[int]:
+        """Encode text to token ranks (bytes missing from the vocabulary are skipped)."""
+        tokens = []
+        for match in PRETOKENIZE_PATTERN.finditer(text):
+            tokens.extend(self._encode_piece(match.group().encode('utf-8')))
+        return tokens
+
+    def count(self, text: str) -> int:
+        """
+        Count tokens, always len(encode(text)). Repeated pre-tokenized pieces
+        are merged only once.
+        """
+        piece_counts = self._piece_counts
+        if len(piece_counts) > PIECE_CACHE_LIMIT:
+            piece_counts.clear()
+
+        total = 0
+        for match in PRETOKENIZE_PATTERN.finditer(text):
+            piece = match.group()
+            n = piece_counts.get(piece)
+            if n is None:
+                n = len(self._encode_piece(piece.encode('utf-8')))
+                piece_counts[piece] = n
+            total += n
+        return total
+
+
+def load_tokenizer(vocab_path: str | None = None):
+    """Return a BPE tokenizer for vocab_path, or the heuristic when none is given."""
+    if vocab_path:
+        return BPETokenizer(Path(vocab_path))
+    return HeuristicTokenizer()
+
+
+class TokenCache:
+    """
+    Persistent token counts keyed by tokenizer name and content hash.
+
+    Only entries used during a run are written back, so counts for deleted
+    or edited files do not accumulate. Long-running callers (--watch) call
+    prune() at each rebuild to drop counts for content that is gone.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries = {}
+        self.used = {}
+        self.keys = {}  # path -> key of its latest counted content
+        self.hits = 0
+        self.misses = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def count(self, tokenizer, text: str, path=None) -> int:
+        key = f"{tokenizer.name}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+        if path is not None:
+            self.keys[path] = key
+        tokens = self.entries.get(key)
+        if tokens is None:
+            tokens = tokenizer.count(text)
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.used[key] = tokens
+        return tokens
+
+    def prune(self, paths):
+        """
+        Reset the used entries to the latest counts for paths, forgetting
+        everything else (edited-away content, removed files).
+        """
+        keys = {path: self.keys[path] for path in paths if path in self.keys}
+        self.used = {key: self.used[key] for key in keys.values() if key in self.used}
+        self.entries = dict(self.used)
+        self.keys = keys
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'entries': self.used}, f)
@@ -1,15 +1,45 @@
 #!/usr/bin/env python3
 """
 Validate a context library for common issues.
-Checks cross-references, duplications, and structure.
+Checks cross-references, duplications, and structure. Near-duplicate modules
+(paraphrased or reordered overlap) are found with MinHash/LSH and ranked by
+estimated Jaccard similarity and reported as warnings; they only fail the
+run with --fail-on-duplicates.
+
+Usage:
+    python validate_library.py <library_dir> [--watch] [--similarity 0.5] [--fail-on-duplicates]
+                               [--jobs N]
+
+Examples:
+    python validate_library.py ./context-library/modules
+    python validate_library.py ./context-library/modules --watch
+    python validate_library.py ./context-library/modules --jobs 16
 """
 
 import os
 import sys
 import re
+import time
+import argparse
 import yaml
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from near_duplicates import DEFAULT_THRESHOLD, find_near_duplicates, minhash_signature
+from timings import add_timing_arguments, start_timings, finish_timings, phase
+from watch import watch_files
+
+
+# Compiled once at import; shared by every module scanned
+REFERENCE_PATTERN = re.compile(r'\[([A-Z][^\]]+)\]')
+SENTENCE_PATTERN = re.compile(r'[.!?]\s+')
+MARKERS = ('PROPOSED', 'HIGH-STAKES')
+# Build-time markers and cross-references, for scan_module_text()
+SCAN_PATTERN = re.compile(
+    r'\[(?=(?:(?P<marker>' + '|'.join(MARKERS) + r')|(?P<reference>[A-Z][^\]]+))\])'
+)
 
 
 def parse_frontmatter(content: str) -> tuple:
@@ -26,36 +56,91 @@ def parse_frontmatter(content: str) -> tuple:
     return {}, content
 
 
+def strip_code_blocks(content: str) -> str:
+    """
+    Remove fenced code blocks, pairing each ``` with the next one (the same
+    result as the lazy regex substitution this replaces).
+    Pairs fences with str.find, which skips ahead in C instead of stepping the
+    regex engine through every character of the block.
+    """
+    pieces = []
+    pos = 0
+    while True:
+        start = content.find('```', pos)
+        if start < 0:
+            break
+        end = content.find('```', start + 3)
+        if end < 0:
+            break
+        pieces.append(content[pos:start])
+        pos = end + 3
+    if not pieces:
+        return content
+    pieces.append(content[pos:])
+    return ''.join(pieces)
+
+
+def scan_module_text(content: str) -> dict:
+    """
+    Collect everything validation needs from a module body.
+
+    Returns a record with:
+    - references: cross-references, as find_references() returns them
+    - markers: build-time marker counts, as find_content_markers() returns them
+    - prose: content with fenced code blocks removed (for duplication checks)
+
+    References and markers come from one pass of SCAN_PATTERN. The reference
+    is matched in a lookahead, so a marker inside an earlier reference is
+    still counted; references that start inside an earlier one are skipped,
+    as findall() would. Fences are left to strip_code_blocks(): adding them
+    to the alternation costs the pattern its literal '[' prefix, and with it
+    the fast search, which made the scan about 8x slower.
+    """
+    references = []
+    markers = dict.fromkeys(MARKERS, 0)
+    reference_end = 0
+    for match in SCAN_PATTERN.finditer(content):
+        marker = match.group('marker')
+        if marker:
+            markers[marker] += 1
+        start = match.start()
+        if start < reference_end:
+            continue
+        reference = marker or match.group('reference')
+        reference_end = start + len(reference) + 2
+        if not reference.startswith('http') and '/' not in reference:
+            references.append(reference)
+    return {'references': references, 'markers': markers, 'prose': strip_code_blocks(content)}
+
+
 def find_references(content: str) -> list:
     """Find cross-references in content."""
     # Pattern: [Module Name] or See [Module Name]
-    pattern = r'\[([A-Z][^\]]+)\]'
-    matches = re.findall(pattern, content)
+    matches = REFERENCE_PATTERN.findall(content)
     # Filter out likely markdown links
-    refs = [m for m in matches if not m.startswith('http') and '/' not in m]
-    return refs
+    return [m for m in matches if not m.startswith('http') and '/' not in m]
 
 
 def find_content_markers(content: str) -> dict:
     """Count content markers in content."""
-    markers = {
-        'PROPOSED': len(re.findall(r'\[PROPOSED\]', content)),
-        'HIGH-STAKES': len(re.findall(r'\[HIGH-STAKES\]', content))
-    }
-    return markers
+    return {marker: content.count(f'[{marker}]') for marker in MARKERS}
 
 
-def extract_key_phrases(content: str, min_words: int = 5) -> set:
-    """Extract key phrases for duplication detection."""
+def extract_key_phrases(content: str, min_words: int = 5, strip_code: bool = True) -> set:
+    """
+    Extract key phrases for duplication detection.
+    Pass strip_code=False when code blocks were already removed.
+    """
     # Remove code blocks
-    content = re.sub(r'```[\s\S]*?```', '', content)
+    if strip_code:
+        content = strip_code_blocks(content)
     # Remove frontmatter
     if content.startswith('---'):
         parts = content.split('---', 2)
         if len(parts) >= 3:
             content = parts[2]
 
-    sentences = re.split(r'[.!?]\s+', content)
+    sentences = SENTENCE_PATTERN.split(content)
     phrases = set()
 
     for sentence in sentences:
@@ -74,8 +159,20 @@ def analyze_module(filepath: Path) -> dict:
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
-
         frontmatter, body = parse_frontmatter(content)
+    except Exception as e:
+        return {'path': str(filepath), 'filename': filepath.name, 'error': str(e)}
+    return module_analysis(filepath, content, frontmatter, body)
+
+
+def module_analysis(filepath: Path, content: str, frontmatter: dict, body: str) -> dict:
+    """
+    Validation record for a module whose content is already loaded and parsed.
+    Holds only derived fields, not the text, so records stay small when they
+    are sent back from worker processes.
+    """
+    try:
+        scan = scan_module_text(body)
 
         return {
             'path': str(filepath),
@@ -85,11 +182,11 @@ def analyze_module(filepath: Path) -> dict:
             'tier': frontmatter.get('tier'),
             'purpose': frontmatter.get('purpose'),
             'confidence': frontmatter.get('confidence'),
-            'references': find_references(body),
-            'markers': find_content_markers(body),
-            'phrases': extract_key_phrases(body),
+            'references': scan['references'],
+            'markers': scan['markers'],
+            'phrases': extract_key_phrases(scan['prose'], strip_code=False),
+            'signature': minhash_signature(scan['prose'], strip_code=False),
             'has_agent_instructions': 'agent instructions' in body.lower(),
-            'content': content,
             'error': None
         }
     except Exception as e:
@@ -112,58 +209,96 @@ def find_modules(library_dir: Path) -> list:
     return modules
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: validate_library.py <library_dir>")
-        sys.exit(1)
-
-    library_dir = Path(sys.argv[1])
-
-    if not library_dir.exists():
-        print(f"Error: Directory '{library_dir}' not found")
-        sys.exit(1)
-
-    module_files = find_modules(library_dir)
-
-    if not module_files:
-        print(f"No modules found in '{library_dir}'")
-        sys.exit(0)
-
-    modules = []
-    module_names = set()
-    all_phrases = defaultdict(list)  # phrase -> list of modules containing it
+def analyze_modules(module_files: list, jobs: int = 1) -> list:
+    """
+    Analyze modules, on a process pool when jobs > 1.
+    Results are returned in module_files order either way.
+    """
+    if jobs > 1 and len(module_files) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunksize = max(1, len(module_files) // (jobs * 4))
+            return list(executor.map(analyze_module, module_files, chunksize=chunksize))
+    return [analyze_module(mf) for mf in module_files]
+
+
+class DuplicateIndex:
+    """
+    Phrase -> modules index for duplication detection.
+
+    Modules can be added, replaced, or removed one at a time, and the set of
+    phrases shared by more than one module is kept up to date as they are.
+    """
+
+    def __init__(self):
+        self.modules = defaultdict(set)  # phrase -> module paths
+        self.phrases = {}  # module path -> phrases
+        self.shared = set()  # phrases found in more than one module
+
+    def add(self, path: str, phrases: set):
+        self.remove(path)
+        self.phrases[path] = phrases
+        for phrase in phrases:
+            paths = self.modules[phrase]
+            paths.add(path)
+            if len(paths) == 2:
+                self.shared.add(phrase)
+
+    def remove(self, path: str):
+        for phrase in self.phrases.pop(path, ()):
+            paths = self.modules[phrase]
+            paths.discard(path)
+            if len(paths) < 2:
+                self.shared.discard(phrase)
+            if not paths:
+                del self.modules[phrase]
+
+    def duplicates(self, order: list[str]) -> list[tuple[str, list[str]]]:
+        """Return (phrase, module paths) for shared phrases, in module order."""
+        position = {path: i for i, path in enumerate(order)}
+        found = [
+            (phrase, sorted(self.modules[phrase], key=position.__getitem__))
+            for phrase in self.shared
+        ]
+        found.sort(key=lambda item: (position[item[1][0]], item[0]))
+        return found
+
+
+def build_duplicate_index(modules: list) -> DuplicateIndex:
+    """Index the key phrases of every analyzed module."""
+    index = DuplicateIndex()
+    for m in modules:
+        if not m.get('error'):
+            index.add(m['path'], m['phrases'])
+    return index
+
+
+def check_library(modules: list, duplicate_index: DuplicateIndex,
+                  similarity: float = DEFAULT_THRESHOLD,
+                  fail_on_duplicates: bool = False) -> tuple[list, list]:
+    """
+    Run validation checks over analyzed modules.
+    Near-duplicate pairs are warnings unless fail_on_duplicates is set.
+    Returns (report lines, issues).
+    """
+    lines = []
     issues = []
+    filenames = {m['path']: m['filename'] for m in modules}
 
-    print("Library Validation Report")
-    print("=========================")
-    print(f"Directory: {library_dir}")
-    print(f"Modules found: {len(module_files)}")
-    print()
-
-    # Analyze all modules
-    for mf in module_files:
-        result = analyze_module(mf)
-        modules.append(result)
-
-        if result.get('error'):
-            issues.append(f"ERROR reading {result['filename']}: {result['error']}")
+    module_names = set()
+    for m in modules:
+        if m.get('error'):
+            issues.append(f"ERROR reading {m['filename']}: {m['error']}")
             continue
+        if m['module_name']:
+            module_names.add(m['module_name'])
+        if m['module_id']:
+            module_names.add(m['module_id'])
 
-        if result['module_name']:
-            module_names.add(result['module_name'])
-        if result['module_id']:
-            module_names.add(result['module_id'])
-
-        # Track phrases for duplication detection
-        for phrase in result.get('phrases', set()):
-            all_phrases[phrase].append(result['filename'])
-
-    # Check for issues
-    print("VALIDATION CHECKS")
-    print("-" * 50)
+    lines.append("VALIDATION CHECKS")
+    lines.append("-" * 50)
 
     # 1. Frontmatter completeness
-    print("\n1. Frontmatter Completeness")
+    lines.append("\n1. Frontmatter Completeness")
     required_fields = ['module_id', 'module_name', 'tier', 'purpose']
     for m in modules:
         if m.get('error'):
@@ -171,12 +306,12 @@ def main():
         missing = [f for f in required_fields if not m.get(f)]
         if missing:
             issues.append(f"  {m['filename']}: Missing {', '.join(missing)}")
-            print(f"  FAIL: {m['filename']} missing {', '.join(missing)}")
+            lines.append(f"  FAIL: {m['filename']} missing {', '.join(missing)}")
         else:
-            print(f"  OK: {m['filename']}")
+            lines.append(f"  OK: {m['filename']}")
 
     # 2. Cross-reference validation
-    print("\n2. Cross-Reference Validation")
+    lines.append("\n2. Cross-Reference Validation")
     for m in modules:
         if m.get('error'):
             continue
@@ -184,22 +319,34 @@ def main():
             # Check if reference matches any known module
             if ref not in module_names:
                 # Could be a valid reference to something else, just warn
-                print(f"  WARN: {m['filename']} references '{ref}' - verify exists")
+                lines.append(f"  WARN: {m['filename']} references '{ref}' - verify exists")
 
     # 3. Duplication check
-    print("\n3. Duplication Check")
-    duplicates_found = False
-    for phrase, files in all_phrases.items():
-        if len(files) > 1:
-            duplicates_found = True
-            issues.append(f"  Possible duplicate in {', '.join(files)}: '{phrase[:50]}...'")
-            print(f"  WARN: Similar content in {', '.join(files)}")
+    lines.append("\n3. Duplication Check")
+    duplicates = duplicate_index.duplicates([m['path'] for m in modules])
+    for phrase, paths in duplicates:
+        files = [filenames[p] for p in paths]
+        issues.append(f"  Possible duplicate in {', '.join(files)}: '{phrase[:50]}...'")
+        lines.append(f"  WARN: Similar content in {', '.join(files)}")
+
+    if not duplicates:
+        lines.append("  OK: No obvious duplications detected")
+
+    # Paraphrased or reordered overlap, ranked by estimated Jaccard similarity
+    signatures = {m['path']: m['signature'] for m in modules if not m.get('error')}
+    near_duplicates = find_near_duplicates(signatures, similarity)
+    for a, b, score in near_duplicates:
+        if fail_on_duplicates:
+            issues.append(f"  Near-duplicate modules {filenames[a]} and {filenames[b]} (~{score:.0%} similar)")
+            lines.append(f"  FAIL: {score:.0%} similar: {filenames[a]} <-> {filenames[b]}")
+        else:
+            lines.append(f"  WARN: {score:.0%} similar: {filenames[a]} <-> {filenames[b]}")
 
-    if not duplicates_found:
-        print("  OK: No obvious duplications detected")
+    if not near_duplicates:
+        lines.append(f"  OK: No near-duplicate module pairs (>= {similarity:.0%} similar)")
 
     # 4. Build artifact check (markers should be removed before delivery)
-    print("\n4. Build Artifacts (should be 0 in finished library)")
+    lines.append("\n4. Build Artifacts (should be 0 in finished library)")
     for m in modules:
         if m.get('error'):
             continue
@@ -207,32 +354,54 @@ def main():
         proposed = markers.get('PROPOSED', 0)
         high_stakes = markers.get('HIGH-STAKES', 0)
         if proposed > 0 or high_stakes > 0:
-            print(f"  WARN: {m['filename']}: {proposed} [PROPOSED], {high_stakes} [HIGH-STAKES] — remove before delivery")
+            lines.append(f"  WARN: {m['filename']}: {proposed} [PROPOSED], {high_stakes} [HIGH-STAKES] — remove before delivery")
             issues.append(f"  {m['filename']}: Build-time markers not removed ({proposed} PROPOSED, {high_stakes} HIGH-STAKES)")
         else:
-            print(f"  OK: {m['filename']}: no build-time markers")
+            lines.append(f"  OK: {m['filename']}: no build-time markers")
 
     # 5. Agent instructions (standard guardrail modules are exempt)
-    print("\n5. Agent Instructions Section")
+    lines.append("\n5. Agent Instructions Section")
     guardrail_prefixes = ('F_agent_behavioral_standards', 'S_natural_prose_standards')
     for m in modules:
         if m.get('error'):
             continue
         if m['filename'].startswith(guardrail_prefixes):
-            print(f"  SKIP: {m['filename']} (standard guardrail module)")
+            lines.append(f"  SKIP: {m['filename']} (standard guardrail module)")
             continue
         if not m.get('has_agent_instructions'):
             issues.append(f"  {m['filename']}: Missing Agent Instructions section")
-            print(f"  WARN: {m['filename']} missing Agent Instructions")
+            lines.append(f"  WARN: {m['filename']} missing Agent Instructions")
         else:
-            print(f"  OK: {m['filename']}")
+            lines.append(f"  OK: {m['filename']}")
+
+    return lines, issues
+
+
+def print_report(library_dir: Path, modules: list, duplicate_index: DuplicateIndex,
+                 similarity: float = DEFAULT_THRESHOLD, fail_on_duplicates: bool = False) -> int:
+    """Print the validation report. Returns the exit status (1 if issues found)."""
+    with phase('check', files=len(modules)):
+        lines, issues = check_library(modules, duplicate_index, similarity, fail_on_duplicates)
+    return print_results(library_dir, len(modules), lines, issues)
+
+
+def print_results(library_dir: Path, module_count: int, lines: list, issues: list) -> int:
+    """Print check_library() results. Returns the exit status (1 if issues found)."""
+    print("Library Validation Report")
+    print("=========================")
+    print(f"Directory: {library_dir}")
+    print(f"Modules found: {module_count}")
+    print()
+
+    for line in lines:
+        print(line)
 
     # Summary
     print()
     print("=" * 50)
     print("SUMMARY")
     print("=" * 50)
-    print(f"Modules analyzed: {len(modules)}")
+    print(f"Modules analyzed: {module_count}")
     print(f"Issues found: {len(issues)}")
 
     if issues:
@@ -242,12 +411,94 @@ def main():
             print(issue)
         print()
         print("Status: NEEDS FIXES")
-        sys.exit(1)
+        return 1
     else:
         print()
         print("Status: PASS")
+        return 0
+
+
+def watch_library(library_dir: Path, similarity: float = DEFAULT_THRESHOLD, jobs: int = 1,
+                  fail_on_duplicates: bool = False):
+    """Print the report, then re-validate whenever a module changes."""
+    module_files = find_modules(library_dir)
+    results = dict(zip(module_files, analyze_modules(module_files, jobs)))
+    duplicate_index = build_duplicate_index(results.values())
+
+    def render():
+        print_report(library_dir, list(results.values()), duplicate_index, similarity,
+                     fail_on_duplicates)
+        sys.stdout.flush()
+
+    def on_change(changed, removed):
+        start = time.perf_counter()
+        # Only changed modules are re-parsed; the phrase index is patched in place
+        for path in removed:
+            results.pop(path, None)
+            duplicate_index.remove(str(path))
+        for path in changed:
+            result = analyze_module(path)
+            results[path] = result
+            if result.get('error'):
+                duplicate_index.remove(str(path))
+            else:
+                duplicate_index.add(str(path), result['phrases'])
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"\n--- {datetime.now():%H:%M:%S}: {len(changed) + len(removed)} module(s) changed, "
+              f"re-analyzed in {elapsed_ms:.1f} ms ---\n", file=sys.stderr)
+        render()
+
+    render()
+    directories = [library_dir] + [library_dir / d for d in ('foundation', 'shared', 'specialized')]
+    watch_files(lambda: find_modules(library_dir), on_change, directories)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Validate a context library for common issues.'
+    )
+    parser.add_argument('library_dir',
+                       help='Path to library/ folder with modules')
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running and re-validate when modules change')
+    parser.add_argument('--similarity', type=float, default=DEFAULT_THRESHOLD,
+                       help=f'Near-duplicate threshold, estimated Jaccard 0-1 (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--fail-on-duplicates', action='store_true',
+                       help='Count near-duplicate module pairs as issues instead of warnings')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Analyze modules on N worker processes (default: 1)')
+    add_timing_arguments(parser)
+
+    args = parser.parse_args()
+    library_dir = Path(args.library_dir)
+
+    if not library_dir.exists():
+        print(f"Error: Directory '{library_dir}' not found")
+        sys.exit(1)
+
+    if args.watch:
+        watch_library(library_dir, args.similarity, args.jobs, args.fail_on_duplicates)
+        return
+
+    start_timings('validate_library', args)
+    with phase('discover') as record:
+        module_files = find_modules(library_dir)
+        record['files'] = len(module_files)
+
+    if not module_files:
+        print(f"No modules found in '{library_dir}'")
+        finish_timings()
         sys.exit(0)
 
+    with phase('analyze', paths=module_files):
+        modules = analyze_modules(module_files, args.jobs)
+    with phase('index', files=len(modules)):
+        duplicate_index = build_duplicate_index(modules)
+    status = print_report(library_dir, modules, duplicate_index, args.similarity,
+                          args.fail_on_duplicates)
+    finish_timings()
+    sys.exit(status)
+
 
 if __name__ == '__main__':
     main()
@@ -4,24 +4,45 @@ Verify module facts against source documents.
 Flags content that doesn't appear in any source file.
 
 Usage:
-    python verify_module.py <module_path> <source_dir>
+    python verify_module.py <module_path> <source_dir> [--index FILE]
+    python verify_module.py --library <library_dir> <source_dir> [--index FILE] [--jobs N] [--json]
+                            [--output FILE]
 
-Example:
+Examples:
     python verify_module.py ./context-library/modules/foundation/F1_identity.md ./sources
+    python verify_module.py --library ./context-library/modules ./sources --json --output verify.json
+
+With --index FILE, source text is kept in a persistent index so repeated
+runs over the same sources only re-read files whose size or modification
+time changed. Keep the index file outside the source tree; without --index
+the sources are scanned directly and nothing is written.
 """
 
 import sys
 import re
+import json
+import argparse
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
 
+from count_tokens import find_modules
+from mapped_file import MappedFile
+from source_files import find_documents
+from timings import add_timing_arguments, start_timings, finish_timings, phase, record_cache
+
 
 def extract_facts(module_path: Path) -> list[tuple[str, str]]:
     """
     Extract potential facts (names, numbers, emails, etc.) from module.
     Returns list of (fact, category) tuples.
     """
-    content = module_path.read_text()
+    return find_facts(module_path.read_text())
+
 
+def find_facts(content: str) -> list[tuple[str, str]]:
+    """Extract (fact, category) tuples from module text that is already loaded."""
     facts = []
 
     # EINs
@@ -56,61 +77,400 @@ def extract_facts(module_path: Path) -> list[tuple[str, str]]:
     return facts
 
 
-def search_sources(fact: str, source_dir: Path) -> str | None:
-    """Search for fact in source files. Returns filename if found, None otherwise."""
-    for source_file in source_dir.rglob('*.md'):
+def search_order(documents: list[Path]) -> list[Path]:
+    """Order discovered documents for searching (.md first, then .txt)."""
+    return ([p for p in documents if p.suffix == '.md'] +
+            [p for p in documents if p.suffix == '.txt'])
+
+
+def find_source_files(source_dir: Path) -> list[Path]:
+    """
+    List source files in the order they are searched. Hidden files and
+    directories (.git, ...) are skipped, as in the other scripts.
+    """
+    return search_order(find_documents(source_dir))
+
+
+def search_sources_batch(facts: list[str], source_dir: Path,
+                         source_files: list[Path] | None = None) -> dict[str, str | None]:
+    """
+    Search for many facts with a single walk of the source tree.
+    Returns {fact: filename or None}, matching search_sources() per fact.
+    source_files, when given, replaces the walk (in search order).
+
+    Each file is memory-mapped once and searched in place for the facts
+    still unresolved, so the cost is one corpus pass instead of one per
+    fact, and file contents are never copied into memory. Files that are
+    not valid UTF-8 are skipped with a warning, as the index skips them.
+    """
+    pending = list(dict.fromkeys(facts))
+    found = {}
+
+    if source_files is None:
+        source_files = find_source_files(source_dir)
+
+    for source_file in source_files:
+        if not pending:
+            break
         try:
-            content = source_file.read_text()
-            if fact in content:
-                return source_file.name
-        except Exception:
+            source = MappedFile(source_file)
+        except OSError:
             continue
 
-    # Also check .txt files
-    for source_file in source_dir.rglob('*.txt'):
+        unresolved = []
+        with source:
+            if not source.is_utf8():
+                warn_undecodable(source_file)
+                continue
+            for fact in pending:
+                if source.contains(fact):
+                    found[fact] = source_file.name
+                else:
+                    unresolved.append(fact)
+        pending = unresolved
+
+    for fact in pending:
+        found[fact] = None
+
+    return found
+
+
+def warn_undecodable(source_file: Path):
+    """Report a source file skipped because it is not valid UTF-8."""
+    print(f"Warning: skipping {source_file}: not valid UTF-8", file=sys.stderr)
+
+
+def search_sources(fact: str, source_dir: Path) -> str | None:
+    """Search for fact in source files. Returns filename if found, None otherwise."""
+    return search_sources_batch([fact], source_dir)[fact]
+
+
+def open_source_index(index_path: Path) -> sqlite3.Connection:
+    """
+    Open (or create) a persistent source index.
+
+    Uses an FTS5 trigram table for substring lookups when SQLite supports it,
+    otherwise a plain table scanned with instr().
+    """
+    conn = sqlite3.connect(str(index_path))
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS files ('
+        'path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, docid INTEGER)'
+    )
+    try:
+        conn.execute(
+            'CREATE VIRTUAL TABLE IF NOT EXISTS source_text '
+            'USING fts5(content, tokenize="trigram case_sensitive 1")'
+        )
+    except sqlite3.OperationalError:
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS source_text ('
+            'rowid INTEGER PRIMARY KEY, content TEXT)'
+        )
+    conn.commit()
+    return conn
+
+
+def update_source_index(conn: sqlite3.Connection, source_dir: Path,
+                        source_files: list[Path] | None = None) -> tuple[list[tuple[str, int]], int]:
+    """
+    Bring the index up to date with the source tree (or with source_files,
+    when the caller has already listed them in search order).
+
+    Only files whose (path, mtime, size) changed are re-read. Files that
+    are not valid UTF-8 are recorded without text (and skipped with a
+    warning), like unreadable ones. Returns the indexed (relative path,
+    docid) pairs in search order, plus the number of files that were
+    re-indexed.
+    """
+    if source_files is None:
+        source_files = find_source_files(source_dir)
+    indexed = {
+        path: (mtime_ns, size, docid)
+        for path, mtime_ns, size, docid in conn.execute(
+            'SELECT path, mtime_ns, size, docid FROM files'
+        )
+    }
+    ordered = []
+    seen = set()
+    reindexed = 0
+
+    with conn:
+        for source_file in source_files:
+            rel_path = str(source_file.relative_to(source_dir))
+            seen.add(rel_path)
+            try:
+                stat = source_file.stat()
+            except OSError:
+                continue
+
+            previous = indexed.get(rel_path)
+            if previous and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                docid = previous[2]
+            else:
+                if previous and previous[2] is not None:
+                    conn.execute('DELETE FROM source_text WHERE rowid = ?', (previous[2],))
+                try:
+                    content = source_file.read_text(encoding='utf-8')
+                    docid = conn.execute(
+                        'INSERT INTO source_text (content) VALUES (?)', (content,)
+                    ).lastrowid
+                except UnicodeDecodeError:
+                    warn_undecodable(source_file)
+                    docid = None
+                except Exception:
+                    docid = None
+                conn.execute(
+                    'INSERT OR REPLACE INTO files (path, mtime_ns, size, docid) VALUES (?, ?, ?, ?)',
+                    (rel_path, stat.st_mtime_ns, stat.st_size, docid)
+                )
+                reindexed += 1
+
+            if docid is not None:
+                ordered.append((rel_path, docid))
+
+        for rel_path, (_, _, docid) in indexed.items():
+            if rel_path not in seen:
+                if docid is not None:
+                    conn.execute('DELETE FROM source_text WHERE rowid = ?', (docid,))
+                conn.execute('DELETE FROM files WHERE path = ?', (rel_path,))
+
+    return ordered, reindexed
+
+
+def search_source_index(conn: sqlite3.Connection, facts: list[str],
+                        ordered: list[tuple[str, int]]) -> dict[str, str | None]:
+    """
+    Look up facts in an up-to-date index.
+    Returns {fact: filename or None}, matching search_sources() per fact.
+    """
+    uses_fts = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'source_text'"
+    ).fetchone()[0].upper().find('FTS5') >= 0
+    position = {docid: i for i, (_, docid) in enumerate(ordered)}
+
+    found = {}
+    for fact in dict.fromkeys(facts):
+        if uses_fts and len(fact) >= 3:
+            # Trigram MATCH narrows candidates; instr() confirms the exact substring
+            rows = conn.execute(
+                'SELECT rowid FROM source_text WHERE source_text MATCH ? AND instr(content, ?) > 0',
+                ('"' + fact.replace('"', '""') + '"', fact)
+            )
+        else:
+            rows = conn.execute(
+                'SELECT rowid FROM source_text WHERE instr(content, ?) > 0', (fact,)
+            )
+        hits = [position[docid] for (docid,) in rows if docid in position]
+        found[fact] = Path(ordered[min(hits)][0]).name if hits else None
+
+    return found
+
+
+def resolve_facts(facts: list[str], source_dir: Path, index_path: Path | None,
+                  log_file=sys.stdout, source_files: list[Path] | None = None) -> dict[str, str | None]:
+    """
+    Resolve facts against sources, through the persistent index when one is given.
+    Falls back to a single in-memory pass if the index cannot be used.
+    """
+    if index_path is not None:
         try:
-            content = source_file.read_text()
-            if fact in content:
-                return source_file.name
-        except Exception:
-            continue
+            conn = open_source_index(index_path)
+            try:
+                with phase('index') as record:
+                    ordered, reindexed = update_source_index(conn, source_dir, source_files)
+                    record['files'] = len(ordered)
+                record_cache('source_index', len(ordered) - reindexed, reindexed)
+                print(f"Source index: {index_path} ({reindexed} of {len(ordered)} files re-indexed)",
+                      file=log_file)
+                with phase('search', files=len(ordered)):
+                    return search_source_index(conn, facts, ordered)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Warning: source index unavailable ({e}); scanning sources directly",
+                  file=log_file)
+
+    with phase('search'):
+        return search_sources_batch(facts, source_dir, source_files)
+
+
+def verify_library(library_dir: Path, source_dir: Path, index_path: Path | None,
+                   jobs: int | None = None, log_file=sys.stdout) -> dict:
+    """
+    Verify every module in a library against one shared source lookup.
 
-    return None
+    Facts are extracted from all modules in parallel, de-duplicated, and
+    resolved together. Returns a report dict with per-module results.
+    """
+    module_files = sorted(find_modules(library_dir))
+
+    with phase('extract', paths=module_files), ProcessPoolExecutor(max_workers=jobs) as executor:
+        module_facts = list(executor.map(extract_facts, module_files))
+
+    all_facts = [fact for facts in module_facts for fact, _ in facts]
+    sources = resolve_facts(all_facts, source_dir, index_path, log_file=log_file)
+    return verification_report(library_dir, source_dir, module_files, module_facts, sources)
+
+
+def verification_report(library_dir: Path, source_dir: Path, module_files: list[Path],
+                        module_facts: list[list[tuple[str, str]]], sources: dict) -> dict:
+    """Build the per-module report from extracted facts and their resolved sources."""
+    modules = []
+    unverified = []
+    total_verified = 0
+    for module_path, facts in zip(module_files, module_facts):
+        rel_path = str(module_path.relative_to(library_dir))
+        results = []
+        for fact, category in facts:
+            source = sources[fact]
+            results.append({'fact': fact, 'category': category, 'source': source})
+            if source:
+                total_verified += 1
+            else:
+                unverified.append({'module': rel_path, 'fact': fact, 'category': category})
+        modules.append({
+            'module': rel_path,
+            'facts': results,
+            'verified': sum(1 for r in results if r['source']),
+            'unverified': sum(1 for r in results if not r['source']),
+        })
+
+    return {
+        'verification_date': datetime.now().isoformat(),
+        'library_directory': str(library_dir),
+        'source_directory': str(source_dir),
+        'summary': {
+            'modules': len(modules),
+            'facts': sum(len(facts) for facts in module_facts),
+            'verified': total_verified,
+            'unverified': len(unverified),
+        },
+        'modules': modules,
+        'unverified': unverified,
+    }
+
+
+def print_library_report(report: dict):
+    """Print human-readable consolidated library report."""
+    summary = report['summary']
+    print(f"Verifying {summary['facts']} extracted facts from {summary['modules']} modules...")
+    print(f"Library directory: {report['library_directory']}")
+    print(f"Source directory: {report['source_directory']}")
+    print()
+
+    for m in report['modules']:
+        status = "✓" if not m['unverified'] else "✗"
+        print(f"{status} {m['module']}: {m['verified']} verified, {m['unverified']} unverified")
+
+    print()
+    print("=" * 60)
+    print(f"RESULTS: {summary['verified']} verified, {summary['unverified']} unverified")
+    print("=" * 60)
+
+    if report['unverified']:
+        print()
+        print("⚠️  UNVERIFIED FACTS - Review these carefully:")
+        for item in report['unverified']:
+            print(f"  - {item['module']}: [{item['category']}] {item['fact']}")
+        print()
+        print("Actions needed:")
+        print("1. Search source files manually for these facts")
+        print("2. If found: the pattern may need adjustment (contact maintainer)")
+        print("3. If NOT found: remove from module or flag for user review")
+    else:
+        print()
+        print("✓ All extracted facts verified against sources")
 
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: verify_module.py <module_path> <source_dir>")
-        print("Example: verify_module.py ./modules/F1_identity.md ./sources")
+    parser = argparse.ArgumentParser(
+        description='Verify module facts against source documents.'
+    )
+    parser.add_argument('module_path', nargs='?',
+                       help='Path to the module file to verify (omit with --library)')
+    parser.add_argument('source_dir',
+                       help='Directory containing source documents')
+    parser.add_argument('--library', type=str,
+                       help='Verify every module in this library (foundation/, shared/, specialized/)')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Worker processes for --library fact extraction (default: CPU count)')
+    parser.add_argument('--json', action='store_true',
+                       help='Output the --library report as JSON')
+    parser.add_argument('--output', '-o', type=str,
+                       help='Write the --library report to file instead of stdout')
+    parser.add_argument('--index', type=str,
+                       help='Keep a persistent source index in FILE (default: scan sources directly)')
+    add_timing_arguments(parser)
+
+    args = parser.parse_args()
+    source_dir = Path(args.source_dir)
+
+    if not source_dir.exists():
+        print(f"Error: Source directory '{source_dir}' not found")
         sys.exit(1)
 
-    module_path = Path(sys.argv[1])
-    source_dir = Path(sys.argv[2])
+    index_path = Path(args.index) if args.index else None
+
+    if args.library:
+        library_dir = Path(args.library)
+        if not library_dir.exists():
+            print(f"Error: Library directory '{library_dir}' not found")
+            sys.exit(1)
+
+        log_file = sys.stderr if args.json or args.output else sys.stdout
+        start_timings('verify_module', args)
+        report = verify_library(library_dir, source_dir, index_path, args.jobs, log_file=log_file)
+
+        if args.json:
+            output_str = json.dumps(report, indent=2)
+        else:
+            import io
+            old_stdout = sys.stdout
+            sys.stdout = io.StringIO()
+            print_library_report(report)
+            output_str = sys.stdout.getvalue()
+            sys.stdout = old_stdout
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output_str)
+            print(f"Output written to {args.output}", file=sys.stderr)
+        else:
+            print(output_str)
+
+        finish_timings()
+        sys.exit(1 if report['unverified'] else 0)
+
+    if not args.module_path:
+        parser.error('module_path is required unless --library is given')
+
+    module_path = Path(args.module_path)
 
     if not module_path.exists():
         print(f"Error: Module file '{module_path}' not found")
         sys.exit(1)
 
-    if not source_dir.exists():
-        print(f"Error: Source directory '{source_dir}' not found")
-        sys.exit(1)
-
-    facts = extract_facts(module_path)
+    start_timings('verify_module', args)
+    with phase('extract', paths=[module_path]):
+        facts = extract_facts(module_path)
 
     if not facts:
         print("No extractable facts found (EINs, emails, phones, years, amounts, quotes, URLs)")
         print("Manual verification recommended for names and other content.")
+        finish_timings()
         sys.exit(0)
 
     print(f"Verifying {len(facts)} extracted facts from {module_path.name}...")
     print(f"Source directory: {source_dir}")
-    print()
 
     verified = []
     unverified = []
+    sources = resolve_facts([fact for fact, _ in facts], source_dir, index_path)
+    print()
 
     for fact, category in facts:
-        source = search_sources(fact, source_dir)
+        source = sources[fact]
         if source:
             verified.append((fact, category, source))
             print(f"✓ [{category}] '{fact}' found in {source}")
@@ -133,6 +493,7 @@ def main():
         print("1. Search source files manually for these facts")
         print("2. If found: the pattern may need adjustment (contact maintainer)")
         print("3. If NOT found: remove from module or flag for user review")
+        finish_timings()
         sys.exit(1)
     else:
         print()
@@ -140,6 +501,7 @@ def main():
         print()
         print("Note: This script checks patterns (EINs, emails, dates, etc.)")
         print("Manual review still recommended for names and descriptive content.")
+        finish_timings()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+"""
+File watching for the --watch modes of context library scripts.
+
+Changes are detected by comparing (mtime_ns, size) snapshots of the watched
+files. On Linux, inotify (through ctypes, no extra packages) wakes the loop
+as soon as a watched directory changes; elsewhere the loop polls.
+
+Usage (from another script):
+    from watch import watch_files
+    watch_files(list_files, on_change, [library_dir])
+"""
+
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import select
+from pathlib import Path
+
+
+POLL_INTERVAL = 1.0  # seconds between polls without inotify
+DEBOUNCE = 0.05  # seconds to let editors finish writing before rescanning
+
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM |
+              IN_MOVED_TO | IN_CREATE | IN_DELETE)
+
+
+class Inotify:
+    """Minimal inotify wrapper: wait until any watched directory changes."""
+
+    def __init__(self, directories: list[Path]):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init()
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init failed')
+        for directory in directories:
+            if directory.is_dir():
+                libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+
+    def wait(self, timeout: float) -> bool:
+        """Block until an event arrives or timeout passes. Returns True on events."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        time.sleep(DEBOUNCE)
+        while select.select([self.fd], [], [], 0)[0]:
+            os.read(self.fd, 65536)
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+def snapshot(paths: list[Path]) -> dict:
+    """Map each existing path to its (mtime_ns, size)."""
+    state = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def watch_files(list_files, on_change, directories: list[Path], interval: float = POLL_INTERVAL):
+    """
+    Call on_change(changed, removed) whenever the files returned by
+    list_files() are added, edited, or deleted. Runs until interrupted.
+
+    changed and removed are sets of Paths. The caller is expected to have
+    processed the initial file set already.
+    """
+    inotify = None
+    if sys.platform.startswith('linux'):
+        try:
+            inotify = Inotify(directories)
+        except (OSError, AttributeError):
+            inotify = None
+
+    print(f"Watching for changes ({'inotify' if inotify else 'polling'}). Press Ctrl-C to stop.",
+          file=sys.stderr)
+
+    previous = snapshot(list_files())
+    try:
+        while True:
+            if inotify:
+                # Time out periodically to catch directories created after startup
+                inotify.wait(interval * 5)
+            else:
+                time.sleep(interval)
+
+            current = snapshot(list_files())
+            changed = {p for p, s in current.items() if previous.get(p) != s}
+            removed = set(previous) - set(current)
+            previous = current
+
+            if changed or removed:
+                on_change(changed, removed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if inotify:
+            inotify.close()
@@ -7,10 +7,13 @@ channels, videos, and playlists. Does NOT download video files.
 
 Usage:
     python fetch_youtube.py channel "https://www.youtube.com/@channel" --output ./output
+    python fetch_youtube.py channel "https://www.youtube.com/@channel" --output ./output --update
     python fetch_youtube.py video "https://www.youtube.com/watch?v=xxxxx" --output ./output
     python fetch_youtube.py playlist "https://www.youtube.com/playlist?list=xxxxx" --output ./output
     python fetch_youtube.py filter manifest.json --keyword "term" --output filtered.json
     python fetch_youtube.py transcripts manifest.json --output ./transcripts
+    python fetch_youtube.py transcripts manifest.json --output ./transcripts --concurrency 8
+    python fetch_youtube.py transcripts manifest.json --output ./transcripts --batch-size 25
 
 Requirements:
     pip install yt-dlp
@@ -22,12 +25,72 @@ import argparse
 import json
 import os
 import re
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Transcript fetching: default pacing (yt-dlp starts per second) and throttling retries
+DEFAULT_RATE = 1.0
+THROTTLE_RETRIES = 4
+THROTTLE_BACKOFF = 5.0  # seconds; doubles on each retry
+THROTTLE_PATTERN = re.compile(
+    r"HTTP Error 429|Too Many Requests|rate[- ]?limit|confirm you.re not a bot",
+    re.IGNORECASE
+)
+ERROR_ID_PATTERN = re.compile(r"\[youtube\] ([\w-]+):")
+ERROR_PREFIX = "ERROR: "
+
+# Video listing: give up when yt-dlp prints nothing for this long
+LIST_IDLE_TIMEOUT = 300
+PROGRESS_EVERY = 500  # videos between progress lines
+OVERVIEW_ROWS = 100  # videos listed in a channel overview
+
+# Transcript runs record each video's outcome here as it happens, so they can resume
+JOURNAL_FILENAME = "transcript-journal.ndjson"
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by transcript workers.
+
+    Allows `rate` acquisitions per second on average, in bursts of up to
+    `capacity`. pause() holds every worker back after a throttling response.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold back all callers for at least `seconds`."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
 
 
 def check_yt_dlp():
@@ -131,12 +194,193 @@ def format_views(count: Optional[int]) -> str:
     return str(count)
 
 
-def fetch_channel_videos(channel_url: str, output_dir: Path) -> Dict:
-    """Fetch all video metadata from a channel."""
+def video_entry(data: Dict) -> Dict:
+    """Manifest record for one video from a --flat-playlist --dump-json line."""
+    return {
+        "id": data.get("id"),
+        "title": data.get("title"),
+        "url": f"https://www.youtube.com/watch?v={data.get('id')}",
+        "duration": data.get("duration"),
+        "duration_string": format_duration(data.get("duration")),
+        "view_count": data.get("view_count"),
+        "view_count_string": format_views(data.get("view_count")),
+        "upload_date": data.get("upload_date"),
+        "description": data.get("description", ""),
+    }
+
+
+def stream_json_lines(cmd: List[str], idle_timeout: float = LIST_IDLE_TIMEOUT) -> Iterator[Dict]:
+    """
+    Run a yt-dlp command and yield each JSON line of its output as it arrives.
+
+    Lines that are not valid JSON are skipped. Raises subprocess.TimeoutExpired
+    if yt-dlp prints nothing for idle_timeout seconds, and
+    subprocess.CalledProcessError (with its stderr) if it exits with an error.
+    """
+    # stderr goes to a file so a chatty yt-dlp can never block on a full pipe
+    with tempfile.TemporaryFile(mode="w+") as stderr:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr, text=True)
+        last_output = [time.monotonic()]
+        timed_out = threading.Event()
+
+        def watchdog():
+            while proc.poll() is None:
+                if time.monotonic() - last_output[0] > idle_timeout:
+                    timed_out.set()
+                    proc.kill()
+                    return
+                time.sleep(1)
+
+        threading.Thread(target=watchdog, daemon=True).start()
+        try:
+            for line in proc.stdout:
+                last_output[0] = time.monotonic()
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+        finally:
+            # Also reached if the caller stops early
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, idle_timeout)
+        if proc.returncode != 0:
+            stderr.seek(0)
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr.read())
+
+
+class ManifestWriter:
+    """
+    Writes channel-manifest.json one video at a time, so long video lists are
+    never held in memory. Output matches json.dump(..., indent=2) of the
+    header fields, the videos list, then the footer fields.
+
+    The file is written under a temporary name and only moved into place by
+    close(), so a failed fetch leaves any previous manifest untouched.
+    """
+
+    def __init__(self, path: Path, header: Dict):
+        self.path = path
+        self.tmp_path = path.with_name(path.name + ".tmp")
+        self.count = 0
+        self.f = open(self.tmp_path, "w")
+        self.f.write("{")
+        for key, value in header.items():
+            self.write_field(key, value)
+            self.f.write(",")
+        self.f.write('\n  "videos": [')
+
+    def write_field(self, key: str, value):
+        value = json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        self.f.write(f"\n  {json.dumps(key)}: {value}")
+
+    def add(self, video: Dict):
+        if self.count:
+            self.f.write(",")
+        self.f.write("\n    " + json.dumps(video, indent=2, ensure_ascii=False).replace("\n", "\n    "))
+        self.count += 1
+
+    def close(self, footer: Dict):
+        """Finish the file with the footer fields and move it into place."""
+        self.f.write("\n  ]" if self.count else "]")
+        for key, value in footer.items():
+            self.f.write(",")
+            self.write_field(key, value)
+        self.f.write("\n}")
+        self.f.close()
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self):
+        """Abandon the partial file."""
+        self.f.close()
+        self.tmp_path.unlink()
+
+
+def write_video_list(lines: Iterator[Dict], writer: ManifestWriter, on_video=video_entry):
+    """
+    Stream a --flat-playlist listing (from stream_json_lines()) into the
+    manifest writer, printing progress as it goes. on_video(data) returns the
+    record to add, or None to skip the line. On any error the partial
+    manifest is discarded and the exception is re-raised.
+    """
+    try:
+        for data in lines:
+            video = on_video(data)
+            if video is None:
+                continue
+            writer.add(video)
+            if writer.count % PROGRESS_EVERY == 0:
+                print(f"  {writer.count} videos...", flush=True)
+    except BaseException:
+        writer.discard()
+        raise
+
+
+def load_previous_manifest(manifest_path: Path, channel_url: str) -> Optional[Dict]:
+    """
+    Load an existing channel manifest for --update, or None if there is
+    none to update. Raises ValueError if it belongs to another source.
+    """
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("source_url") != channel_url:
+        raise ValueError(f"{manifest_path} was fetched from {manifest.get('source_url')}, not {channel_url}")
+    return manifest
+
+
+def videos_until_known(lines: Iterator[Dict], known: Dict[str, Dict]) -> Iterator[Dict]:
+    """
+    Yield listing lines (newest first) up to the first video that is already
+    in the manifest, then stop yt-dlp. Flat listings usually have no
+    upload_date, so the cutoff is by ID rather than by date.
+    """
+    for data in lines:
+        if data.get("id") in known:
+            lines.close()
+            return
+        yield data
+
+
+def fetch_channel_videos(channel_url: str, output_dir: Path, update: bool = False) -> Dict:
+    """
+    Fetch all video metadata from a channel.
+
+    Videos are written to the manifest as yt-dlp lists them, so memory use
+    does not grow with channel size. With update, an existing manifest in
+    output_dir is refreshed instead: only videos newer than the ones it
+    already has are listed, and they are added ahead of them. Returns the
+    manifest fields other than the video list.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / "channel-manifest.json"
 
-    print(f"Fetching channel videos from: {channel_url}")
-    print("This may take a moment for channels with many videos...")
+    previous = None
+    if update:
+        try:
+            previous = load_previous_manifest(manifest_path, channel_url)
+        except (ValueError, json.JSONDecodeError) as e:
+            print(f"Error: cannot update: {e}")
+            return {"error": str(e), "videos": []}
+        if previous is None:
+            print(f"No manifest in {output_dir} yet, fetching all videos")
+
+    if previous is not None:
+        known = {video["id"]: video for video in previous.get("videos", [])}
+        print(f"Updating channel videos from: {channel_url} ({len(known)} already in manifest)")
+    else:
+        print(f"Fetching channel videos from: {channel_url}")
+        print("This may take a moment for channels with many videos...")
+
+    # Get channel metadata
+    channel_info = fetch_channel_info(channel_url)
 
     # Use yt-dlp to get channel video list with metadata
     cmd = [
@@ -148,59 +392,39 @@ def fetch_channel_videos(channel_url: str, output_dir: Path) -> Dict:
         channel_url + "/videos"
     ]
 
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
-
-        if result.returncode != 0:
-            print(f"Error: {result.stderr}")
-            return {"error": result.stderr, "videos": []}
-
-    except subprocess.TimeoutExpired:
-        return {"error": "Timeout fetching channel videos", "videos": []}
-
-    # Parse JSON lines output
-    videos = []
-    for line in result.stdout.strip().split("\n"):
-        if not line:
-            continue
-        try:
-            video_data = json.loads(line)
-            videos.append({
-                "id": video_data.get("id"),
-                "title": video_data.get("title"),
-                "url": f"https://www.youtube.com/watch?v={video_data.get('id')}",
-                "duration": video_data.get("duration"),
-                "duration_string": format_duration(video_data.get("duration")),
-                "view_count": video_data.get("view_count"),
-                "view_count_string": format_views(video_data.get("view_count")),
-                "upload_date": video_data.get("upload_date"),
-                "description": video_data.get("description", ""),
-            })
-            # Rate limiting
-            time.sleep(0.1)
-        except json.JSONDecodeError:
-            continue
-
-    # Get channel metadata
-    channel_info = fetch_channel_info(channel_url)
-
     manifest = {
         "source_url": channel_url,
         "fetched_at": datetime.now().isoformat(),
         "channel": channel_info,
-        "video_count": len(videos),
-        "videos": videos
     }
+    writer = ManifestWriter(manifest_path, manifest)
+    first_videos = []
 
-    # Save manifest
-    manifest_path = output_dir / "channel-manifest.json"
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    def keep_first(video):
+        if len(first_videos) < OVERVIEW_ROWS:
+            first_videos.append(video)
+        return video
+
+    lines = stream_json_lines(cmd)
+    if previous is not None:
+        lines = videos_until_known(lines, known)
+    try:
+        write_video_list(lines, writer, lambda data: keep_first(video_entry(data)))
+    except subprocess.CalledProcessError as e:
+        print(f"Error: {e.stderr}")
+        return {"error": e.stderr, "videos": []}
+    except subprocess.TimeoutExpired:
+        return {"error": "Timeout fetching channel videos", "videos": []}
+
+    new_count = writer.count
+    if previous is not None:
+        # Newly listed videos stay first, as in a full fetch
+        for video in known.values():
+            writer.add(keep_first(video))
+
+    video_count = writer.count
+    manifest["video_count"] = video_count
+    writer.close({"video_count": video_count})
     print(f"Saved manifest: {manifest_path}")
 
     # Generate overview markdown
@@ -209,7 +433,7 @@ def fetch_channel_videos(channel_url: str, output_dir: Path) -> Dict:
         f.write(f"# {channel_info.get('name', 'Channel')} Overview\n\n")
         f.write(f"**URL:** {channel_url}\n")
         f.write(f"**Subscribers:** {format_views(channel_info.get('subscriber_count'))}\n")
-        f.write(f"**Total Videos:** {len(videos)}\n")
+        f.write(f"**Total Videos:** {video_count}\n")
         f.write(f"**Fetched:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
 
         if channel_info.get("description"):
@@ -219,22 +443,30 @@ def fetch_channel_videos(channel_url: str, output_dir: Path) -> Dict:
         f.write("| Title | Date | Duration | Views |\n")
         f.write("|-------|------|----------|-------|\n")
 
-        for video in videos[:100]:  # Limit table to 100 rows
-            title = video["title"][:60] + "..." if len(video.get("title", "")) > 60 else video.get("title", "")
-            date = video.get("upload_date", "")
-            if date and len(date) == 8:
-                date = f"{date[:4]}-{date[4:6]}-{date[6:8]}"
-            f.write(f"| [{title}]({video['url']}) | {date} | {video['duration_string']} | {video['view_count_string']} |\n")
+        for video in first_videos:  # Limit table to 100 rows
+            f.write(channel_overview_row(video))
 
-        if len(videos) > 100:
-            f.write(f"\n*...and {len(videos) - 100} more videos (see manifest for full list)*\n")
+        if video_count > OVERVIEW_ROWS:
+            f.write(f"\n*...and {video_count - OVERVIEW_ROWS} more videos (see manifest for full list)*\n")
 
     print(f"Saved overview: {overview_path}")
-    print(f"Found {len(videos)} videos")
+    if previous is not None:
+        print(f"Found {new_count} new videos ({video_count} total)")
+    else:
+        print(f"Found {video_count} videos")
 
     return manifest
 
 
+def channel_overview_row(video: Dict) -> str:
+    """Markdown table row for a video in a channel overview."""
+    title = video["title"][:60] + "..." if len(video.get("title", "")) > 60 else video.get("title", "")
+    date = video.get("upload_date", "")
+    if date and len(date) == 8:
+        date = f"{date[:4]}-{date[4:6]}-{date[6:8]}"
+    return f"| [{title}]({video['url']}) | {date} | {video['duration_string']} | {video['view_count_string']} |\n"
+
+
 def fetch_channel_info(channel_url: str) -> Dict:
     """Fetch channel metadata."""
     cmd = [
@@ -353,7 +585,13 @@ def fetch_video_metadata(video_url: str, output_dir: Path, include_transcript: b
 
 
 def fetch_playlist_videos(playlist_url: str, output_dir: Path) -> Dict:
-    """Fetch all video metadata from a playlist."""
+    """
+    Fetch all video metadata from a playlist.
+
+    Videos are written to the manifest (and overview rows to a temporary
+    file) as yt-dlp lists them. Returns the manifest fields other than the
+    video list.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
 
     print(f"Fetching playlist videos: {playlist_url}")
@@ -366,77 +604,55 @@ def fetch_playlist_videos(playlist_url: str, output_dir: Path) -> Dict:
         playlist_url
     ]
 
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-
-        if result.returncode != 0:
-            return {"error": result.stderr, "videos": []}
-
-    except subprocess.TimeoutExpired:
-        return {"error": "Timeout fetching playlist", "videos": []}
-
-    videos = []
+    manifest = {
+        "source_url": playlist_url,
+        "fetched_at": datetime.now().isoformat(),
+    }
+    manifest_path = output_dir / "channel-manifest.json"
+    writer = ManifestWriter(manifest_path, manifest)
     playlist_title = "Playlist"
 
-    for line in result.stdout.strip().split("\n"):
-        if not line:
-            continue
-        try:
-            data = json.loads(line)
+    with tempfile.TemporaryFile(mode="w+") as rows:
+        def add_row(data):
+            nonlocal playlist_title
             if data.get("_type") == "playlist":
                 playlist_title = data.get("title", "Playlist")
-                continue
-
-            videos.append({
-                "id": data.get("id"),
-                "title": data.get("title"),
-                "url": f"https://www.youtube.com/watch?v={data.get('id')}",
-                "duration": data.get("duration"),
-                "duration_string": format_duration(data.get("duration")),
-                "view_count": data.get("view_count"),
-                "view_count_string": format_views(data.get("view_count")),
-                "upload_date": data.get("upload_date"),
-                "description": data.get("description", ""),
-            })
-        except json.JSONDecodeError:
-            continue
+                return None
+            video = video_entry(data)
+            title = video["title"][:50] + "..." if len(video.get("title", "")) > 50 else video.get("title", "")
+            rows.write(f"| {writer.count + 1} | [{title}]({video['url']}) | {video['duration_string']} | {video['view_count_string']} |\n")
+            return video
 
-    manifest = {
-        "source_url": playlist_url,
-        "fetched_at": datetime.now().isoformat(),
-        "playlist_title": playlist_title,
-        "video_count": len(videos),
-        "videos": videos
-    }
+        try:
+            write_video_list(stream_json_lines(cmd), writer, add_row)
+        except subprocess.CalledProcessError as e:
+            return {"error": e.stderr, "videos": []}
+        except subprocess.TimeoutExpired:
+            return {"error": "Timeout fetching playlist", "videos": []}
 
-    manifest_path = output_dir / "channel-manifest.json"
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2, ensure_ascii=False)
-    print(f"Saved manifest: {manifest_path}")
+        video_count = writer.count
+        manifest["playlist_title"] = playlist_title
+        manifest["video_count"] = video_count
+        writer.close({"playlist_title": playlist_title, "video_count": video_count})
+        print(f"Saved manifest: {manifest_path}")
 
-    # Generate overview
-    overview_path = output_dir / "channel-overview.md"
-    with open(overview_path, "w") as f:
-        f.write(f"# {playlist_title}\n\n")
-        f.write(f"**URL:** {playlist_url}\n")
-        f.write(f"**Total Videos:** {len(videos)}\n")
-        f.write(f"**Fetched:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
+        # Generate overview
+        overview_path = output_dir / "channel-overview.md"
+        with open(overview_path, "w") as f:
+            f.write(f"# {playlist_title}\n\n")
+            f.write(f"**URL:** {playlist_url}\n")
+            f.write(f"**Total Videos:** {video_count}\n")
+            f.write(f"**Fetched:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
 
-        f.write("## Videos\n\n")
-        f.write("| # | Title | Duration | Views |\n")
-        f.write("|---|-------|----------|-------|\n")
+            f.write("## Videos\n\n")
+            f.write("| # | Title | Duration | Views |\n")
+            f.write("|---|-------|----------|-------|\n")
 
-        for i, video in enumerate(videos, 1):
-            title = video["title"][:50] + "..." if len(video.get("title", "")) > 50 else video.get("title", "")
-            f.write(f"| {i} | [{title}]({video['url']}) | {video['duration_string']} | {video['view_count_string']} |\n")
+            rows.seek(0)
+            shutil.copyfileobj(rows, f)
 
     print(f"Saved overview: {overview_path}")
-    print(f"Found {len(videos)} videos in playlist")
+    print(f"Found {video_count} videos in playlist")
 
     return manifest
 
@@ -517,24 +733,97 @@ def filter_videos(manifest_path: Path, output_path: Optional[Path] = None, **fil
     return filtered_manifest
 
 
-def fetch_transcripts_for_videos(videos: List[Dict], output_dir: Path) -> Dict:
-    """Fetch transcripts for a list of videos."""
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    results = {
-        "fetched": [],
-        "unavailable": [],
-        "errors": []
-    }
-
-    for i, video in enumerate(videos):
-        video_id = video.get("id")
-        if not video_id:
+def save_transcript(video: Dict, output_dir: Path, vtt_files: List[Path]) -> Dict:
+    """
+    Convert a downloaded VTT file to <video-id>.md and remove the VTT files.
+    The .md file is written under a temporary name and moved into place, so
+    an interrupted write never leaves a partial transcript for resume to keep.
+    """
+    video_id = video["id"]
+    url = f"https://www.youtube.com/watch?v={video_id}"
+
+    # Convert VTT to plain text markdown
+    vtt_path = vtt_files[0]
+    md_path = output_dir / f"{video_id}.md"
+    tmp_path = md_path.with_name(md_path.name + ".tmp")
+
+    transcript_text = convert_vtt_to_text(vtt_path)
+
+    with open(tmp_path, "w") as f:
+        f.write(f"# Transcript: {video.get('title', video_id)}\n\n")
+        f.write(f"**Video:** {url}\n")
+        f.write(f"**Duration:** {video.get('duration_string', 'Unknown')}\n\n")
+        f.write("---\n\n")
+        f.write(transcript_text)
+    os.replace(tmp_path, md_path)
+
+    # Clean up VTT files
+    for vtt in vtt_files:
+        vtt.unlink()
+
+    return {"id": video_id, "title": video.get("title"), "file": str(md_path)}
+
+
+def throttled_ids(stderr: str) -> Tuple[set, bool]:
+    """
+    Find throttled videos in yt-dlp stderr.
+    Returns (video IDs named in throttling errors, whether any throttling
+    error could not be tied to a video).
+    """
+    ids = set()
+    unattributed = False
+    for line in stderr.splitlines():
+        if THROTTLE_PATTERN.search(line):
+            match = ERROR_ID_PATTERN.search(line)
+            if match:
+                ids.add(match.group(1))
+            else:
+                unattributed = True
+    return ids, unattributed
+
+
+def failed_ids(stderr: str) -> Tuple[Dict[str, str], Optional[str]]:
+    """
+    Find failed videos in yt-dlp stderr.
+    Returns (error message per video ID named in an ERROR: line, the first
+    ERROR: message that could not be tied to a video).
+    """
+    errors = {}
+    unattributed = None
+    for line in stderr.splitlines():
+        if not line.startswith(ERROR_PREFIX):
             continue
-
-        print(f"Fetching transcript ({i+1}/{len(videos)}): {video.get('title', video_id)[:50]}...")
-
-        url = f"https://www.youtube.com/watch?v={video_id}"
+        message = line[len(ERROR_PREFIX):].strip()
+        match = ERROR_ID_PATTERN.search(line)
+        if match:
+            errors.setdefault(match.group(1), message)
+        elif unattributed is None:
+            unattributed = message
+    return errors, unattributed
+
+
+def fetch_transcript_batch(videos: List[Dict], output_dir: Path, limiter: Optional[TokenBucket] = None,
+                           retries: int = THROTTLE_RETRIES) -> List[Tuple[Dict, str, Dict]]:
+    """
+    Fetch transcripts for one or more videos with a single yt-dlp process
+    and save each as <video-id>.md.
+
+    Returns (video, outcome, entry) per video, in order, where outcome is
+    "fetched", "unavailable" or "errors". Subtitle files are matched back
+    to videos by the ID in their file name. Videos that yt-dlp reports as
+    throttled are retried together with exponential backoff (pausing every
+    worker sharing the limiter).
+
+    A video without subtitles is "unavailable" only when yt-dlp reported no
+    error for it. Videos named in an ERROR: line, and every video of a run
+    that failed without naming any, are "errors", which resume retries.
+    """
+    outcomes = {}
+    pending = list(videos)
+
+    for attempt in range(retries + 1):
+        if limiter:
+            limiter.acquire()
 
         # Try to get subtitles
         cmd = [
@@ -544,65 +833,215 @@ def fetch_transcripts_for_videos(videos: List[Dict], output_dir: Path) -> Dict:
             "--sub-lang", "en",
             "--sub-format", "vtt",
             "--skip-download",
-            "--output", str(output_dir / f"{video_id}"),
+            "--output", str(output_dir / "%(id)s"),
             "--no-warnings",
-            url
-        ]
+        ] + [f"https://www.youtube.com/watch?v={video['id']}" for video in pending]
 
+        timed_out = False
+        throttled, throttled_all = set(), False
+        failed, failed_all = {}, None
         try:
             result = subprocess.run(
                 cmd,
                 capture_output=True,
                 text=True,
-                timeout=60
+                timeout=60 * len(pending)
             )
+            throttled, throttled_all = throttled_ids(result.stderr)
+            failed, failed_all = failed_ids(result.stderr)
+            if result.returncode != 0 and not failed and failed_all is None:
+                failed_all = f"yt-dlp exited with status {result.returncode}"
+        except subprocess.TimeoutExpired:
+            timed_out = True
 
-            # Check for subtitle file
-            vtt_files = list(output_dir.glob(f"{video_id}*.vtt"))
+        retry = []
+        for video in pending:
+            video_id = video["id"]
+            # Check for subtitle files (<video-id>.<lang>.vtt)
+            vtt_files = sorted(output_dir.glob(f"{video_id}.*vtt"))
             if vtt_files:
-                # Convert VTT to plain text markdown
-                vtt_path = vtt_files[0]
-                md_path = output_dir / f"{video_id}.md"
-
-                transcript_text = convert_vtt_to_text(vtt_path)
-
-                with open(md_path, "w") as f:
-                    f.write(f"# Transcript: {video.get('title', video_id)}\n\n")
-                    f.write(f"**Video:** {url}\n")
-                    f.write(f"**Duration:** {video.get('duration_string', 'Unknown')}\n\n")
-                    f.write("---\n\n")
-                    f.write(transcript_text)
-
-                # Clean up VTT file
-                vtt_path.unlink()
-
-                results["fetched"].append({
-                    "id": video_id,
-                    "title": video.get("title"),
-                    "file": str(md_path)
-                })
-                print(f"  Saved: {md_path.name}")
+                outcomes[video_id] = ("fetched", save_transcript(video, output_dir, vtt_files))
+            elif timed_out:
+                outcomes[video_id] = ("errors", {"id": video_id, "error": "Timeout"})
+            elif video_id in throttled or throttled_all:
+                retry.append(video)
+            elif video_id in failed or failed_all:
+                outcomes[video_id] = ("errors", {"id": video_id, "error": failed.get(video_id, failed_all)})
+            else:
+                outcomes[video_id] = ("unavailable", {"id": video_id, "title": video.get("title")})
+
+        pending = retry
+        if not pending:
+            break
+        if attempt < retries:
+            delay = THROTTLE_BACKOFF * 2 ** attempt
+            if limiter:
+                limiter.pause(delay)
             else:
-                results["unavailable"].append({
-                    "id": video_id,
-                    "title": video.get("title")
-                })
-                print(f"  No transcript available")
+                time.sleep(delay)
+
+    for video in pending:
+        outcomes[video["id"]] = ("errors", {"id": video["id"], "error": "Throttled"})
+
+    return [(video, *outcomes[video["id"]]) for video in videos]
+
+
+def load_journal(journal_path: Path) -> Dict[str, Tuple[str, Dict]]:
+    """
+    Read a transcript journal. Returns the latest (outcome, entry) per
+    video ID. A partly written last line (from an interrupted run) is ignored.
+    """
+    outcomes = {}
+    if not journal_path.exists():
+        return outcomes
+    with open(journal_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                outcomes[record["id"]] = (record["outcome"], record["entry"])
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+    return outcomes
+
+
+def open_journal(journal_path: Path, resume: bool):
+    """
+    Open a transcript journal for appending, or start a new one without
+    resume. A partly written last line is ended first, so the next record
+    starts on a line of its own.
+    """
+    if not resume:
+        return open(journal_path, "w")
+    journal = open(journal_path, "a+b")
+    if journal.tell():
+        journal.seek(-1, os.SEEK_END)
+        if journal.read(1) != b"\n":
+            journal.write(b"\n")
+    journal.close()
+    return open(journal_path, "a")
+
+
+def finished_transcript(video: Dict, output_dir: Path, journal: Dict) -> Optional[Tuple[str, Dict]]:
+    """
+    The recorded (outcome, entry) for a video that needs no refetch, or None.
+    A transcript counts as fetched while its .md file exists, including
+    files from runs made before the journal existed. Errors are retried.
+    """
+    video_id = video["id"]
+    md_path = output_dir / f"{video_id}.md"
+    outcome, entry = journal.get(video_id, (None, None))
+    if outcome == "unavailable":
+        return outcome, entry
+    if md_path.exists():
+        if outcome != "fetched":
+            entry = {"id": video_id, "title": video.get("title"), "file": str(md_path)}
+        return "fetched", entry
+    return None
 
-        except subprocess.TimeoutExpired:
-            results["errors"].append({
-                "id": video_id,
-                "error": "Timeout"
-            })
-            print(f"  Timeout")
 
-        # Rate limiting
-        time.sleep(1)
+def report_transcript(outcome: str, entry: Dict, results: Dict, journal=None):
+    """
+    Add a fetch_transcript_batch() result to the run results, append it to
+    the journal file (if given), and print it.
+    """
+    results[outcome].append(entry)
+    if journal:
+        record = {"id": entry["id"], "outcome": outcome, "entry": entry, "at": datetime.now().isoformat()}
+        journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        journal.flush()
+    if outcome == "fetched":
+        print(f"  Saved: {Path(entry['file']).name}")
+    elif outcome == "unavailable":
+        print(f"  No transcript available")
+    else:
+        print(f"  {entry['error']}")
+
+
+def fetch_transcripts_for_videos(videos: List[Dict], output_dir: Path, concurrency: int = 1,
+                                 rate: float = DEFAULT_RATE, batch_size: int = 1,
+                                 resume: bool = True) -> Dict:
+    """
+    Fetch transcripts for a list of videos.
+
+    Videos are fetched batch_size at a time per yt-dlp process, so a run
+    starts len(videos) / batch_size processes. With concurrency > 1, up to
+    that many processes run at once, started no faster than `rate` per
+    second, and each result is reported as soon as its batch finishes.
+
+    Every outcome is appended to <output_dir>/transcript-journal.ndjson as
+    it happens. With resume, videos already fetched or known to have no
+    transcript are skipped; errors and timeouts are retried.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    results = {
+        "fetched": [],
+        "unavailable": [],
+        "errors": []
+    }
+
+    journal_path = output_dir / JOURNAL_FILENAME
+    previous = load_journal(journal_path) if resume else {}
+    pending = []
+    for video in videos:
+        if not video.get("id"):
+            continue
+        finished = finished_transcript(video, output_dir, previous) if resume else None
+        if finished:
+            results[finished[0]].append(finished[1])
+        else:
+            pending.append(video)
+    skipped = sum(len(entries) for entries in results.values())
+    if skipped:
+        print(f"Resuming: {skipped} videos already done, {len(pending)} to fetch")
+
+    with open_journal(journal_path, resume) as journal:
+        fetch_pending_transcripts(pending, output_dir, results, journal, concurrency, rate, batch_size)
 
     print(f"\nTranscripts: {len(results['fetched'])} fetched, {len(results['unavailable'])} unavailable, {len(results['errors'])} errors")
     return results
 
 
+def fetch_pending_transcripts(pending: List[Dict], output_dir: Path, results: Dict, journal,
+                              concurrency: int = 1, rate: float = DEFAULT_RATE, batch_size: int = 1):
+    """Fetch and report transcripts for videos not yet done (see fetch_transcripts_for_videos)."""
+    batch_size = max(1, batch_size)
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+    if concurrency <= 1:
+        done = 0
+        for batch in batches:
+            if len(batch) == 1:
+                video = batch[0]
+                print(f"Fetching transcript ({done+1}/{len(pending)}): {video.get('title', video['id'])[:50]}...")
+            else:
+                print(f"Fetching transcripts ({done+1}-{done+len(batch)}/{len(pending)})...")
+            for video, outcome, entry in fetch_transcript_batch(batch, output_dir):
+                report_transcript(outcome, entry, results, journal)
+            done += len(batch)
+
+            # Rate limiting
+            time.sleep(1 / rate)
+    else:
+        limiter = TokenBucket(rate, capacity=concurrency)
+        print(f"Fetching {len(pending)} transcripts ({concurrency} at a time, {rate:g}/sec)...")
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(fetch_transcript_batch, batch, output_dir, limiter)
+                       for batch in batches]
+            done = 0
+            try:
+                for future in as_completed(futures):
+                    for video, outcome, entry in future.result():
+                        done += 1
+                        print(f"Transcript ({done}/{len(pending)}): {video.get('title', video['id'])[:50]}")
+                        report_transcript(outcome, entry, results, journal)
+            except KeyboardInterrupt:
+                # Don't start queued batches; running ones finish before exit
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+
 def convert_vtt_to_text(vtt_path: Path) -> str:
     """Convert VTT subtitle file to plain text, removing timestamps and deduplicating."""
     with open(vtt_path) as f:
@@ -652,7 +1091,17 @@ def fetch_transcripts_command(args):
         print("No videos to fetch transcripts for")
         return
 
-    results = fetch_transcripts_for_videos(videos, output_dir)
+    if args.rate <= 0:
+        print("Error: --rate must be greater than 0")
+        sys.exit(1)
+
+    try:
+        results = fetch_transcripts_for_videos(videos, output_dir, args.concurrency, args.rate,
+                                               args.batch_size, resume=not args.restart)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted. Progress is saved in {output_dir / JOURNAL_FILENAME}; "
+              "run the same command again to resume.")
+        sys.exit(130)
 
     # Save results summary
     summary_path = output_dir / "transcript-summary.json"
@@ -670,6 +1119,9 @@ Examples:
   Fetch channel videos:
     python fetch_youtube.py channel "https://www.youtube.com/@anthropic-ai" --output ./output
 
+  Add new videos to an existing channel manifest:
+    python fetch_youtube.py channel "https://www.youtube.com/@anthropic-ai" --output ./output --update
+
   Fetch single video:
     python fetch_youtube.py video "https://www.youtube.com/watch?v=xxxxx" --output ./output
 
@@ -681,6 +1133,9 @@ Examples:
 
   Fetch transcripts:
     python fetch_youtube.py transcripts manifest.json --output ./transcripts
+
+  Fetch transcripts, 8 at a time:
+    python fetch_youtube.py transcripts manifest.json --output ./transcripts --concurrency 8
 """
     )
 
@@ -690,6 +1145,8 @@ Examples:
     channel_parser = subparsers.add_parser("channel", help="Fetch videos from a channel")
     channel_parser.add_argument("url", help="Channel URL (e.g., https://www.youtube.com/@handle)")
     channel_parser.add_argument("--output", "-o", default="./output", help="Output directory")
+    channel_parser.add_argument("--update", action="store_true",
+                                help="Add only videos newer than those in the existing manifest")
 
     # Video command
     video_parser = subparsers.add_parser("video", help="Fetch single video metadata")
@@ -718,6 +1175,14 @@ Examples:
     transcripts_parser.add_argument("source", help="Manifest file path")
     transcripts_parser.add_argument("--videos", help="Comma-separated video IDs (optional)")
     transcripts_parser.add_argument("--output", "-o", default="./transcripts", help="Output directory")
+    transcripts_parser.add_argument("--concurrency", "-j", type=int, default=1,
+                                    help="Run up to N yt-dlp processes at once (default: 1)")
+    transcripts_parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                                    help=f"Start at most R requests per second (default: {DEFAULT_RATE:g})")
+    transcripts_parser.add_argument("--batch-size", type=int, default=1,
+                                    help="Fetch N videos per yt-dlp process (default: 1)")
+    transcripts_parser.add_argument("--restart", action="store_true",
+                                    help=f"Ignore {JOURNAL_FILENAME} and existing transcripts; fetch everything again")
 
     args = parser.parse_args()
 
@@ -727,7 +1192,7 @@ Examples:
 
     # Execute command
     if args.command == "channel":
-        fetch_channel_videos(args.url, Path(args.output))
+        fetch_channel_videos(args.url, Path(args.output), update=args.update)
     elif args.command == "video":
         fetch_video_metadata(args.url, Path(args.output), include_transcript=args.transcript)
     elif args.command == "playlist":
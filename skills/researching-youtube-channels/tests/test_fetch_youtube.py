@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Tests for fetch_youtube.py against the stub yt-dlp in tests/bin (no network).
+
+Usage:
+    python tests/test_fetch_youtube.py
+    python -m pytest tests/
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib.machinery
+import importlib.util
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+TESTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TESTS_DIR.parent / "scripts"))
+
+import fetch_youtube  # noqa: E402
+
+# The stub yt-dlp, imported for its listing data
+_loader = importlib.machinery.SourceFileLoader("stub_yt_dlp", str(TESTS_DIR / "bin" / "yt-dlp"))
+stub = importlib.util.module_from_spec(importlib.util.spec_from_loader(_loader.name, _loader))
+_loader.exec_module(stub)
+
+
+class StubTestCase(unittest.TestCase):
+    """Runs fetch_youtube with the stub yt-dlp first on PATH and a fresh output directory."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.output_dir = Path(self.tmp.name) / "out"
+        self.state_dir = Path(self.tmp.name) / "state"
+        self.state_dir.mkdir()
+
+        env = {
+            "PATH": str(TESTS_DIR / "bin") + os.pathsep + os.environ.get("PATH", ""),
+            "STUB_STATE": str(self.state_dir),
+            "STUB_DELAY": "0",
+            "STUB_OFFLINE": "0",
+        }
+        saved = {key: os.environ.get(key) for key in env}
+        os.environ.update(env)
+        self.addCleanup(self.restore_env, saved)
+
+        backoff = fetch_youtube.THROTTLE_BACKOFF
+        fetch_youtube.THROTTLE_BACKOFF = 0.01
+        self.addCleanup(setattr, fetch_youtube, "THROTTLE_BACKOFF", backoff)
+
+    @staticmethod
+    def restore_env(saved):
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    def quietly(self, func, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func(*args, **kwargs)
+
+    def calls(self):
+        """(start, end, video IDs) per stub transcript run, in start order."""
+        log = self.state_dir / "calls.log"
+        if not log.exists():
+            return []
+        calls = []
+        for line in log.read_text().splitlines():
+            start, end, *ids = line.split()
+            calls.append((float(start), float(end), ids))
+        return sorted(calls)
+
+    def fetch(self, ids, **kwargs):
+        kwargs.setdefault("rate", 100)
+        videos = [{"id": video_id, "title": f"Title {video_id}"} for video_id in ids]
+        return self.quietly(fetch_youtube.fetch_transcripts_for_videos, videos, self.output_dir, **kwargs)
+
+
+def ids(entries):
+    return sorted(entry["id"] for entry in entries)
+
+
+class ConcurrentFetchTests(StubTestCase):
+
+    def test_concurrent_fetch(self):
+        os.environ["STUB_DELAY"] = "0.3"
+        videos = [f"vid{i}" for i in range(6)]
+        results = self.fetch(videos, concurrency=3, rate=50)
+
+        self.assertEqual(ids(results["fetched"]), videos)
+        self.assertEqual(results["unavailable"] + results["errors"], [])
+        for video_id in videos:
+            text = (self.output_dir / f"{video_id}.md").read_text()
+            self.assertIn(f"hello from {video_id}", text)
+
+        calls = self.calls()
+        self.assertEqual(len(calls), 6)
+        overlap = max(sum(1 for start, end, _ in calls if start <= t < end) for t, _, _ in calls)
+        self.assertGreaterEqual(overlap, 2)
+
+    def test_throttle_then_succeed_pauses_all_workers(self):
+        fetch_youtube.THROTTLE_BACKOFF = 1.0
+        os.environ["STUB_DELAY"] = "0.1"
+        videos = ["throttle1"] + [f"vid{i}" for i in range(8)]
+        results = self.fetch(videos, concurrency=2, rate=50)
+
+        self.assertEqual(ids(results["fetched"]), sorted(videos))
+        self.assertEqual(results["errors"], [])
+
+        calls = self.calls()
+        throttle_calls = [call for call in calls if call[2] == ["throttle1"]]
+        self.assertEqual(len(throttle_calls), 2)
+        throttled_at = throttle_calls[0][1]
+        self.assertGreaterEqual(throttle_calls[1][0], throttled_at + 0.95)
+        # No worker starts yt-dlp while the shared limiter is paused (the stub
+        # logs its start after interpreter startup, hence the lead-in)
+        during_pause = [call for call in calls if throttled_at + 0.4 <= call[0] < throttled_at + 0.95]
+        self.assertEqual(during_pause, [])
+
+    def test_mixed_batch(self):
+        videos = [{"id": video_id, "title": video_id} for video_id in ("ok1", "none1", "fail1", "throttle1", "block1")]
+        self.output_dir.mkdir()
+        outcomes = self.quietly(fetch_youtube.fetch_transcript_batch, videos, self.output_dir)
+
+        self.assertEqual([(video["id"], outcome) for video, outcome, _ in outcomes], [
+            ("ok1", "fetched"),
+            ("none1", "unavailable"),
+            ("fail1", "errors"),
+            ("throttle1", "fetched"),
+            ("block1", "errors"),
+        ])
+        self.assertIn("Unable to download webpage", outcomes[2][2]["error"])
+        self.assertEqual(outcomes[4][2]["error"], "Throttled")
+        # One run for the batch, then retries for the throttled videos only
+        retries = [["block1"]] * (fetch_youtube.THROTTLE_RETRIES - 1)
+        self.assertEqual([call[2] for call in self.calls()],
+                         [["ok1", "none1", "fail1", "throttle1", "block1"], ["throttle1", "block1"]] + retries)
+        self.assertEqual(sorted(path.name for path in self.output_dir.iterdir()), ["ok1.md", "throttle1.md"])
+
+
+class BatchTests(StubTestCase):
+
+    def test_batches_split_videos(self):
+        videos = [f"vid{i}" for i in range(7)]
+        results = self.fetch(videos, batch_size=3)
+
+        self.assertEqual(ids(results["fetched"]), videos)
+        self.assertEqual([call[2] for call in self.calls()], [videos[0:3], videos[3:6], videos[6:]])
+        self.assertEqual(list(self.output_dir.glob("*.vtt")), [])
+
+    def test_batched_outcomes_match_unbatched(self):
+        videos = ["vid0", "none1", "fail2", "throttle3", "vid4", "none5", "vid6", "fail7", "vid8"]
+        batched = self.fetch(videos, concurrency=2, batch_size=4)
+        self.assertEqual(len(self.calls()), 4)  # 3 batches, then a retry for throttle3
+
+        self.output_dir = Path(self.tmp.name) / "unbatched"
+        for marker in self.state_dir.glob("throttled-*"):
+            marker.unlink()
+        unbatched = self.fetch(videos)
+        for outcome in ("fetched", "unavailable", "errors"):
+            self.assertEqual(ids(batched[outcome]), ids(unbatched[outcome]), outcome)
+
+    def test_unattributed_throttle_retries_whole_batch(self):
+        os.environ["STUB_THROTTLE_RUN"] = "1"
+        self.addCleanup(os.environ.pop, "STUB_THROTTLE_RUN")
+        videos = ["vid0", "vid1", "none2"]
+        results = self.fetch(videos, batch_size=3)
+
+        self.assertEqual(ids(results["fetched"]), ["vid0", "vid1"])
+        self.assertEqual(ids(results["unavailable"]), ["none2"])
+        self.assertEqual([call[2] for call in self.calls()], [videos, videos])
+
+    def test_batch_timeout_keeps_written_transcripts(self):
+        os.environ["STUB_DELAY"] = "1.0"
+        run = subprocess.run
+
+        def short_run(*args, **kwargs):
+            return run(*args, **{**kwargs, "timeout": 1.8})
+
+        with mock.patch.object(fetch_youtube.subprocess, "run", short_run):
+            results = self.fetch(["vid0", "vid1", "vid2"], batch_size=3)
+
+        self.assertEqual(ids(results["fetched"]), ["vid0"])
+        self.assertEqual(results["errors"], [{"id": "vid1", "error": "Timeout"},
+                                             {"id": "vid2", "error": "Timeout"}])
+
+
+class ResumeTests(StubTestCase):
+
+    def test_outage_errors_are_retried(self):
+        videos = ["vid0", "vid1", "none2"]
+        os.environ["STUB_OFFLINE"] = "1"
+        offline = self.fetch(videos)
+        self.assertEqual(ids(offline["errors"]), sorted(videos))
+        self.assertEqual(offline["unavailable"], [])
+
+        os.environ["STUB_OFFLINE"] = "0"
+        online = self.fetch(videos)
+        self.assertEqual(ids(online["fetched"]), ["vid0", "vid1"])
+        self.assertEqual(ids(online["unavailable"]), ["none2"])
+        self.assertEqual(len(self.calls()), 6)
+
+    def test_finished_videos_are_skipped(self):
+        videos = ["vid0", "none1", "fail2"]
+        self.fetch(videos)
+        results = self.fetch(videos)
+
+        self.assertEqual(ids(results["fetched"]), ["vid0"])
+        self.assertEqual(ids(results["unavailable"]), ["none1"])
+        self.assertEqual(ids(results["errors"]), ["fail2"])
+        self.assertEqual([call[2] for call in self.calls()[3:]], [["fail2"]])
+
+    def test_restart_refetches_everything(self):
+        videos = ["vid0", "none1"]
+        self.fetch(videos)
+        self.fetch(videos, resume=False)
+        self.assertEqual(len(self.calls()), 4)
+        journal = (self.output_dir / fetch_youtube.JOURNAL_FILENAME).read_text().splitlines()
+        self.assertEqual(len(journal), 2)
+
+    def test_existing_transcripts_count_without_journal(self):
+        self.output_dir.mkdir()
+        (self.output_dir / "vid0.md").write_text("# Transcript: earlier run\n")
+        results = self.fetch(["vid0", "vid1"])
+
+        self.assertEqual(ids(results["fetched"]), ["vid0", "vid1"])
+        self.assertEqual([call[2] for call in self.calls()], [["vid1"]])
+
+    def test_partial_transcript_is_refetched(self):
+        self.output_dir.mkdir()
+        (self.output_dir / "vid0.md.tmp").write_text("# Transcript: interrupted")
+        results = self.fetch(["vid0"])
+
+        self.assertEqual(ids(results["fetched"]), ["vid0"])
+        self.assertIn("hello from vid0", (self.output_dir / "vid0.md").read_text())
+        self.assertFalse((self.output_dir / "vid0.md.tmp").exists())
+
+    def test_truncated_journal_line_is_ignored(self):
+        self.fetch(["none0"])
+        with open(self.output_dir / fetch_youtube.JOURNAL_FILENAME, "a") as f:
+            f.write('{"id": "none1", "outcome": "unava')
+        self.fetch(["none0", "none1"])
+        results = self.fetch(["none0", "none1"])
+
+        self.assertEqual(ids(results["unavailable"]), ["none0", "none1"])
+        self.assertEqual([call[2] for call in self.calls()], [["none0"], ["none1"]])
+
+
+class ListingTests(StubTestCase):
+
+    def set_listing(self, **env):
+        for key, value in env.items():
+            os.environ[key] = str(value)
+            self.addCleanup(os.environ.pop, key, None)
+
+    def expected_videos(self, count):
+        return [fetch_youtube.video_entry(stub.listed_video(number)) for number in range(count, 0, -1)]
+
+    def test_channel_manifest_is_streamed_in_order(self):
+        self.set_listing(STUB_LIST_COUNT=250)
+        self.quietly(fetch_youtube.fetch_channel_videos, "https://www.youtube.com/@stub", self.output_dir)
+
+        text = (self.output_dir / "channel-manifest.json").read_text()
+        manifest = json.loads(text)
+        self.assertEqual(text, json.dumps(manifest, indent=2, ensure_ascii=False))
+        self.assertEqual(list(manifest), ["source_url", "fetched_at", "channel", "videos", "video_count"])
+        self.assertEqual(manifest["channel"]["name"], "Stub Channel")
+        self.assertEqual(manifest["videos"], self.expected_videos(250))
+        self.assertEqual(manifest["video_count"], 250)
+
+        overview = (self.output_dir / "channel-overview.md").read_text()
+        self.assertEqual(overview.count("](https://www.youtube.com/watch?v="), fetch_youtube.OVERVIEW_ROWS)
+        self.assertIn("*...and 150 more videos", overview)
+
+    def test_playlist_manifest(self):
+        self.set_listing(STUB_LIST_COUNT=3)
+        self.quietly(fetch_youtube.fetch_playlist_videos, "https://www.youtube.com/playlist?list=PLstub",
+                     self.output_dir)
+
+        manifest = json.loads((self.output_dir / "channel-manifest.json").read_text())
+        self.assertEqual(manifest["playlist_title"], "Stub Playlist")
+        self.assertEqual(manifest["videos"], self.expected_videos(3))
+        overview = (self.output_dir / "channel-overview.md").read_text()
+        self.assertIn("| 3 | [Video 1 é]", overview)
+
+    def test_failed_listing_keeps_previous_manifest(self):
+        self.set_listing(STUB_LIST_COUNT=5)
+        self.quietly(fetch_youtube.fetch_channel_videos, "https://www.youtube.com/@stub", self.output_dir)
+        manifest_path = self.output_dir / "channel-manifest.json"
+        before = manifest_path.read_text()
+
+        self.set_listing(STUB_LIST_COUNT=500, STUB_LIST_FAIL=200)
+        result = self.quietly(fetch_youtube.fetch_channel_videos, "https://www.youtube.com/@stub", self.output_dir)
+
+        self.assertIn("Unable to download API page", result["error"])
+        self.assertEqual(manifest_path.read_text(), before)
+        self.assertEqual(sorted(path.name for path in self.output_dir.iterdir()),
+                         ["channel-manifest.json", "channel-overview.md"])
+
+    def test_stalled_listing_times_out(self):
+        self.set_listing(STUB_LIST_COUNT=10, STUB_LIST_HANG=4)
+        cmd = ["yt-dlp", "--flat-playlist", "--dump-json", "https://www.youtube.com/@stub/videos"]
+        seen = []
+        with self.assertRaises(subprocess.TimeoutExpired):
+            for data in fetch_youtube.stream_json_lines(cmd, idle_timeout=1):
+                seen.append(data["id"])
+        self.assertEqual(seen, [f"vid{number:05d}" for number in range(10, 6, -1)])
+
+
+if __name__ == "__main__":
+    unittest.main()